@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from AIInterface import AIInterface
-from typing import List, Tuple
+from Board import Board
+from typing import List, Optional, Tuple
 
 
 class State:
@@ -14,11 +15,18 @@ class Action:
 class AI(ABC):
     """An AI is a class that can solve a game. It has to implement the following methods:"""
 
-    def __init__(self, game_interface: AIInterface):
+    def __init__(
+        self, game_interface: Optional[AIInterface] = None, board: Optional[Board] = None
+    ):
+        """Either a game interface or, to solve without a UI, a board has to be given."""
         super().__init__()
         self.game_interface = game_interface
-        self.game_instance = game_interface.game_instance
-        self.board = game_interface.game_instance.board
+        if game_interface is not None:
+            self.game_instance = game_interface.game_instance
+            self.board = game_interface.game_instance.board
+        else:
+            self.game_instance = None
+            self.board = board
 
     @abstractmethod
     def actions(self, state: State) -> List[Action]:
@@ -1,11 +1,14 @@
 import time
+from typing import TYPE_CHECKING
 
-from ui import RicochetRobotsUI
 from Wall import Direction
 
+if TYPE_CHECKING:  # Only needed for type hints, so solvers can run without tkinter
+    from ui import RicochetRobotsUI
+
 
 class AIInterface:
-    def __init__(self, game_instance: RicochetRobotsUI):
+    def __init__(self, game_instance: "RicochetRobotsUI"):
         self.game_instance = game_instance
 
     def move_robot(self, robot_id: int, direction: Direction):
@@ -18,8 +21,7 @@ class AIInterface:
 
         # Set the current robot and move it
         self.game_instance.current_robot = robot_id
-        self.game_instance.move(direction)
-        self.game_instance.update_board()
+        self.game_instance.move(direction)  # Also moves the robot on the canvas
 
         # Use Board's is_on_goal method to check if the robot is on its goal
         robot = self.game_instance.robots[robot_id]
@@ -0,0 +1,153 @@
+"""Solve many start positions and goal assignments on one wall layout.
+
+    solver = BatchSolver(board, "a_star", workers=4, timeout=5)
+    for result in solver.solve_many(queries):
+        print(result.index, result.moves)
+
+A query is a pair of robot positions and goals, where goals None keeps the
+goals of the board. The solver context of the board is built once, before the
+worker processes start, so every worker gets the ray-stop and distance tables
+with its copy of the board. Changing the goals between queries keeps the tables
+that only depend on the walls.
+"""
+import copy
+import os
+import time
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from Board import Board
+from GraphSearchAI import GraphSearchAI, RobotMoves, RobotsState
+from MapDataClass import GoalData, MapData
+from SearchMonitor import DeadlineMonitor, SearchCancelled
+
+Query = Tuple[List[Tuple[int, int]], Optional[List[GoalData]]]
+
+
+class BatchResult(NamedTuple):
+    index: int  # Position of the query in the iterable passed to solve_many
+    robots: List[Tuple[int, int]]
+    solution: Optional[RobotMoves]  # None if unsolved, timed out or failed
+    moves: Optional[int]
+    seconds: float
+    expanded: int
+    timed_out: bool = False
+    error: Optional[str] = None  # Why the algorithm could not solve the query
+
+
+class BatchSolver:
+    def __init__(
+        self,
+        board: Board,
+        ai_type: str = "a_star",
+        workers: int = os.cpu_count() or 1,
+        timeout: Optional[float] = None,
+        **options,
+    ):
+        """
+        Parameters:
+        board (Board): The board of every query. It is copied, so the goals of
+            the queries never change the caller's board.
+        ai_type (str): The algorithm passed to GraphSearchAI.solve.
+        workers (int): Number of worker processes, 1 solves the queries in this process.
+        timeout (Optional[float]): Seconds after which a query is given up.
+        options: Extra keyword arguments for GraphSearchAI, except monitor.
+        """
+        if ai_type == "parallel_bfs" and workers > 1:
+            raise ValueError("parallel_bfs starts its own processes, use workers=1")
+        if "monitor" in options:
+            # Every query gets its own monitor, which enforces the timeout
+            raise ValueError("BatchSolver sets the monitor itself, use timeout instead")
+        self.board = copy.deepcopy(board)
+        self.board.solver_context()  # Built once and shipped to the workers
+        self.board_goals = [
+            GoalData(goal.x, goal.y, goal.robot_number) for goal in board.goals
+        ]
+        self.ai_type = ai_type
+        self.workers = workers
+        self.timeout = timeout
+        self.options = options
+
+    def solve_many(self, queries: Iterable[Query]) -> Iterator[BatchResult]:
+        """Solves the queries and yields their results as they complete.
+
+        With several workers the results come in completion order, use
+        BatchResult.index to match them with the queries.
+
+        Parameters:
+        queries (Iterable[Query]): Robot positions and goals (None for the board's goals).
+
+        Returns:
+        Iterator[BatchResult]: One result per query.
+        """
+        indexed = (
+            (index, [tuple(position) for position in robots], goals)
+            for index, (robots, goals) in enumerate(queries)
+        )
+        if self.workers <= 1:
+            for query in indexed:
+                yield self.solve_query(query)
+            return
+
+        with Pool(self.workers, initializer=init_worker, initargs=(self,)) as pool:
+            yield from pool.imap_unordered(solve_in_worker, indexed)
+
+    def solve_query(
+        self, query: Tuple[int, List[Tuple[int, int]], Optional[List[GoalData]]]
+    ) -> BatchResult:
+        index, robots, goals = query
+        try:
+            # A goal without its robot is never reached, so A* would search the
+            # whole state space before reporting no solution
+            query_goals = self.board_goals if goals is None else goals
+            MapData([], self.board.board_size, robots, query_goals).validate()
+        except ValueError as e:
+            return BatchResult(index, robots, None, None, 0.0, 0, error=str(e))
+        self.use_goals(goals)
+
+        monitor = None if self.timeout is None else DeadlineMonitor(self.timeout)
+        ai = GraphSearchAI(board=self.board, monitor=monitor, **self.options)
+        start_time = time.perf_counter()
+        solution = None
+        timed_out = False
+        error = None
+        try:
+            solution = ai.solve(RobotsState(robots), self.ai_type)
+        except SearchCancelled:
+            timed_out = True
+        except ValueError as e:  # The algorithm does not support this query
+            error = str(e)
+        seconds = time.perf_counter() - start_time
+
+        return BatchResult(
+            index,
+            robots,
+            solution,
+            None if solution is None else len(solution),
+            seconds,
+            ai.stats.expanded,
+            timed_out,
+            error,
+        )
+
+    def use_goals(self, goals: Optional[List[GoalData]]):
+        # Only touch the board when the goals differ, which keeps the solver context
+        if goals is None:
+            goals = self.board_goals
+        current = [(goal.x, goal.y, goal.robot_number) for goal in self.board.goals]
+        if current != [(goal.x_pos, goal.y_pos, goal.robot) for goal in goals]:
+            self.board.clear_goals()
+            self.board.create_goals(goals)
+
+
+# The BatchSolver of a worker process, set by init_worker
+worker_solver: Optional[BatchSolver] = None
+
+
+def init_worker(solver: BatchSolver):
+    global worker_solver
+    worker_solver = solver
+
+
+def solve_in_worker(query) -> BatchResult:
+    return worker_solver.solve_query(query)
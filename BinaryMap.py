@@ -0,0 +1,122 @@
+"""Compact binary map files and a converter from the JSON maps.
+
+    python3 BinaryMap.py maps/*.json
+
+writes maps/<name>.rrmap next to every JSON map. A binary map holds, in order:
+
+- a header: the magic bytes b"RRMP", the format version, the board width and
+  height, the number of robots and the number of goals (one byte each),
+- every goal as x, y and robot number (one byte each),
+- every robot start as x and y (one byte each),
+- the wall bitmask of every cell, one byte per cell indexed y * width + x, with
+  the bits of Wall.DIRECTION_BITS.
+
+The cell bytes become the board's wall index directly, without building the
+walls one by one.
+"""
+import argparse
+import mmap
+import os
+import struct
+from array import array
+from typing import List, Optional, Tuple
+
+from Board import Board
+from MapDataClass import GoalData, load_map
+
+MAGIC = b"RRMP"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBBB")
+
+
+def save_binary_map(path: str, board: Board, robots: List[Tuple[int, int]]):
+    """Writes a board, with its walls and goals, and the robot starts to a binary map.
+
+    Parameters:
+    path (str): The file to write.
+    board (Board): The board to store.
+    robots (List[Tuple[int, int]]): The start position of every robot.
+    """
+    width, height = board.board_size
+    data = bytearray(
+        HEADER.pack(MAGIC, VERSION, width, height, len(robots), len(board.goals))
+    )
+    for goal in board.goals:
+        data += bytes([goal.x, goal.y, goal.robot_number])
+    for x, y in robots:
+        data += bytes([x, y])
+    data += bytes(board.wall_index)
+
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def load_binary_map(path: str) -> Tuple[Board, List[Tuple[int, int]]]:
+    """Reads a binary map written by save_binary_map.
+
+    Parameters:
+    path (str): The binary map file.
+
+    Returns:
+    Tuple[Board, List[Tuple[int, int]]]: The board with its walls and goals, and
+    the start position of every robot.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path} is not a binary map")
+        magic, version, width, height, robot_count, goal_count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary map")
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary map version {version} in {path}")
+
+        goals_offset = HEADER.size
+        robots_offset = goals_offset + 3 * goal_count
+        cells_offset = robots_offset + 2 * robot_count
+        if len(data) != cells_offset + width * height:
+            raise ValueError(f"{path} has the wrong size for a {width}x{height} board")
+
+        goals = [
+            tuple(data[offset : offset + 3])
+            for offset in range(goals_offset, robots_offset, 3)
+        ]
+        robots = [
+            tuple(data[offset : offset + 2])
+            for offset in range(robots_offset, cells_offset, 2)
+        ]
+        wall_index = array("B", data[cells_offset:])
+
+    for x, y, *_ in goals + robots:
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"{path} places a goal or robot outside the board")
+    if len(set(robots)) != len(robots):
+        raise ValueError(f"{path} places two robots on the same cell")
+
+    board = Board((width, height), [GoalData(x, y, robot_id) for x, y, robot_id in goals])
+    board.load_wall_index(wall_index)
+    return board, robots
+
+
+def convert_json_map(json_path: str, binary_path: Optional[str] = None) -> str:
+    """Converts a JSON map, with its goals and robots, to a binary map.
+
+    Returns:
+    str: The path of the binary map, by default the JSON path ending in .rrmap.
+    """
+    if binary_path is None:
+        binary_path = os.path.splitext(json_path)[0] + ".rrmap"
+    map_data = load_map(json_path)
+    save_binary_map(binary_path, Board.from_map(map_data), map_data.robots)
+    return binary_path
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Convert JSON maps to binary maps.")
+    parser.add_argument("maps", nargs="+", help="JSON map files")
+    args = parser.parse_args(argv)
+    for path in args.maps:
+        print(f"{path} -> {convert_json_map(path)}")
+
+
+if __name__ == "__main__":
+    main()
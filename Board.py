@@ -1,27 +1,67 @@
-from typing import List, Tuple
+import hashlib
+from typing import List, Optional, Sequence, Tuple
 from Goal import Goal
-from Wall import Wall, Direction
+from MapDataClass import DEFAULT_BOARD_SIZE, DEFAULT_GOALS, GoalData, MapData, WallData, robot_color
+from SolverContext import SolverContext
+from Wall import DIRECTION_BITS, Wall, Direction
 
 
 class Board:
-    def __init__(self, board_size: Tuple[int, int]):
+    def __init__(
+        self, board_size: Tuple[int, int], goals: Optional[List[GoalData]] = None
+    ):
         # Initialize the board with given size and an empty list of walls
         self.board_size: Tuple[int, int] = board_size
         self.walls: List[Wall] = []
         self.goals: List[Goal] = []
 
-        # Add the goals and walls to the canvas
-        self.create_goals()
+        # Per-cell bitmask of blocked directions, indexed by y * width + x
+        self.wall_index: List[int] = [0] * (board_size[0] * board_size[1])
+
+        # Bumped whenever a wall or goal changes, which drops the solver context
+        self.version = 0
+        self.wall_version = 0  # Only bumped when a wall changes
+        self.context: Optional[SolverContext] = None  # Built on demand
+        # The context dropped by the last goal change, whose wall tables are still valid
+        self.last_context: Optional[SolverContext] = None
+
+        # Add the goals and walls to the canvas. The default goals belong to the
+        # default 16x16 board, other sizes start without goals
+        if goals is None:
+            goals = DEFAULT_GOALS if board_size == DEFAULT_BOARD_SIZE else []
+        self.create_goals(goals)
         self.create_walls()
 
-    def create_goals(self):
-        self.add_goal(0, 7, 0, "red")
-        self.add_goal(15, 0, 1, "blue")
-        # self.add_goal(5, 14, 2, "green")
+    @classmethod
+    def from_map(cls, map_data: MapData) -> "Board":
+        """Builds the board of a map, with its size, goals and walls."""
+        board = cls(map_data.board_size, map_data.goals)
+        board.load_walls(map_data.walls)
+        return board
+
+    def create_goals(self, goals: List[GoalData]):
+        for goal in goals:
+            self.add_goal(goal.x_pos, goal.y_pos, goal.robot, robot_color(goal.robot))
 
     def add_goal(self, x: int, y: int, robot_number: int, color: str):
         goal = Goal(x, y, robot_number, color)
         self.goals.append(goal)
+        self.changed()
+
+    def clear_goals(self):
+        self.goals = []
+        self.changed()
+
+    def changed(self, walls: bool = False):
+        # Walls or goals changed, so the precomputed tables have to be rebuilt,
+        # except for the tables that only depend on unchanged walls
+        self.version += 1
+        if walls:
+            self.wall_version += 1
+            self.last_context = None
+        elif self.context is not None:
+            self.last_context = self.context
+        self.context = None
 
     def create_walls(self):
         return None
@@ -32,6 +72,76 @@ class Board:
         wall = Wall(x, y, direction)
         self.walls.append(wall)
 
+        # Block the move out of this cell and the opposite move out of the neighbour
+        dx, dy = direction.value
+        self.block(x, y, direction)
+        self.block(x + dx, y + dy, ~direction)
+        self.changed(walls=True)
+
+    def load_walls(self, map_data: List[WallData]):  # Adds all walls of a map
+        for data in map_data:
+            if not 1 <= data.direction <= 4:
+                raise ValueError(f"Invalid wall direction: {data.direction}")
+            direction = Direction.from_int(data.direction)
+            # Maps may declare a wall from both of its sides, keep only one
+            if not self.has_wall(data.x_pos, data.y_pos, direction):
+                self.add_wall(data.x_pos, data.y_pos, direction)
+
+    def load_wall_index(self, wall_index: Sequence[int]):
+        """Replaces all walls with a per-cell bitmask index, e.g. read from a binary map.
+
+        Both cells next to a wall have to carry it, otherwise a ValueError is raised.
+        The index is used as is, without copying.
+        """
+        width, height = self.board_size
+        if len(wall_index) != width * height:
+            raise ValueError("The wall index does not match the board size")
+
+        sides = [
+            (direction, DIRECTION_BITS[direction], DIRECTION_BITS[~direction])
+            for direction in Direction
+        ]
+        walls = []
+        for index, mask in enumerate(wall_index):
+            if not mask:
+                continue  # Most cells have no walls
+            if mask & ~0b1111:
+                raise ValueError(f"Invalid wall bits in cell {index}")
+            y, x = divmod(index, width)
+            for direction, bit, opposite_bit in sides:
+                if not mask & bit:
+                    continue
+                dx, dy = direction.value
+                if 0 <= x + dx < width and 0 <= y + dy < height:
+                    if not wall_index[index + dy * width + dx] & opposite_bit:
+                        raise ValueError(
+                            f"The wall {direction.name} of ({x}, {y}) is missing on the other side"
+                        )
+                    if dx > 0 or dy > 0:
+                        continue  # Kept as the WEST or NORTH wall of the neighbour
+                walls.append(Wall(x, y, direction))
+
+        self.walls = walls
+        self.wall_index = wall_index
+        self.changed(walls=True)
+
+    def has_wall(self, x: int, y: int, direction: Direction) -> bool:
+        # Whether the wall is already in the index, looked up from the side on the board
+        dx, dy = direction.value
+        width, height = self.board_size
+        if 0 <= x < width and 0 <= y < height:
+            return bool(self.wall_index[y * width + x] & DIRECTION_BITS[direction])
+        if 0 <= x + dx < width and 0 <= y + dy < height:
+            return bool(
+                self.wall_index[(y + dy) * width + x + dx] & DIRECTION_BITS[~direction]
+            )
+        raise ValueError(f"The wall at ({x}, {y}) is outside the board")
+
+    def block(self, x: int, y: int, direction: Direction):
+        # Marks a direction as blocked in the wall index, ignoring cells outside the board
+        if 0 <= x < self.board_size[0] and 0 <= y < self.board_size[1]:
+            self.wall_index[y * self.board_size[0] + x] |= DIRECTION_BITS[direction]
+
     def is_wall(
         self, from_position: Tuple[int, int], to_position: Tuple[int, int]
     ):  # Check if there's a wall between two positions
@@ -42,41 +152,48 @@ class Board:
 
         # Get the direction of the move
         if dx > 0:
-            move_direction = "EAST"
+            move_direction = Direction.EAST
         elif dx < 0:
-            move_direction = "WEST"
+            move_direction = Direction.WEST
         elif dy > 0:
-            move_direction = "SOUTH"
+            move_direction = Direction.SOUTH
         else:
-            move_direction = "NORTH"
-
-        # Get the opposite directions for wall comparison
-        opposite_direction = {
-            "EAST": "WEST",
-            "WEST": "EAST",
-            "SOUTH": "NORTH",
-            "NORTH": "SOUTH",
-        }
-
-        for wall in self.walls:  # Loops through all walls
-            # print("Wall position:", (wall.x, wall.y), wall.direction.name,
-            #      "\nPlayer position:", (x_from, y_from), move_direction, "\n \n")
-
-            # Checks for walls that's facing the intended direction
-            if (
-                wall.x == x_from
-                and wall.y == y_from
-                and wall.direction.name == move_direction
-            ):
-                return True
-            # Checks for walls that's facing the opposite direction
-            elif (
-                wall.x == x_to
-                and wall.y == y_to
-                and opposite_direction[wall.direction.name] == move_direction
-            ):
-                return True
-        return False
+            move_direction = Direction.NORTH
+
+        # Walls facing the opposite direction are already stored on this cell
+        return bool(
+            self.wall_index[y_from * self.board_size[0] + x_from]
+            & DIRECTION_BITS[move_direction]
+        )
+
+    def solver_context(self) -> SolverContext:
+        """Returns the precomputed tables of the board, built once per board version."""
+        if self.context is None:
+            self.context = SolverContext(self, self.last_context)
+        return self.context
+
+    def ray_stop(
+        self, position: Tuple[int, int], direction: Direction
+    ) -> Tuple[int, int]:  # Where a robot stops when no other robots are in the way
+        context = self.context
+        if context is None:
+            context = self.solver_context()
+        return context.ray_stops[direction][position[1] * self.board_size[0] + position[0]]
+
+    def goal_distances(self, goal_position: Tuple[int, int]) -> List[int]:
+        # See SolverContext.goal_distances
+        return self.solver_context().goal_distances(goal_position)
+
+    def fingerprint(self) -> bytes:
+        """Returns a SHA-256 digest of the board size, the walls and the goals.
+
+        Walls are hashed through the wall index, so the same layout gives the same
+        digest however its walls were declared or loaded.
+        """
+        goals = sorted((goal.x, goal.y, goal.robot_number) for goal in self.goals)
+        digest = hashlib.sha256(repr((self.board_size, goals)).encode())
+        digest.update(bytes(self.wall_index))
+        return digest.digest()
 
     def is_on_goal(self, position: Tuple[int, int], robot_number: int):
         for goal in self.goals:
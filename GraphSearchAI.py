@@ -1,10 +1,22 @@
-from typing import List, Tuple, Optional, NamedTuple, NewType
+from typing import Dict, List, Tuple, Optional, NamedTuple, NewType
 from AI import AI
 from AIInterface import AIInterface
+from Board import Board
 from Robot import Robot, AvailableMove
+from SearchMonitor import SearchMonitor
+from SearchStats import SearchStats
+from SolutionCache import SolutionCache
+from SolveJob import SolveJob
+from StateCodec import StateCodec
+from Tablebase import Tablebase
+from TranspositionTable import TranspositionTable
 from Wall import Direction
 from collections import deque
 from heapq import heappop, heappush
+from NumpyBFS import NumpyBFS
+from ParallelBFS import ParallelBFS
+import math
+import os
 import time
 
 
@@ -16,8 +28,81 @@ class RobotMove(NamedTuple):
 RobotMoves = NewType("RobotMoves", List[RobotMove])
 RobotsState = NewType("RobotsState", List[Tuple[int, int]])
 
+# Methods whose run time is measured when a SearchMonitor asks for phase timing
+PHASES = ("actions", "results", "goal_test", "heuristic", "predecessors")
+
+# Maps the key of every discovered state to its parent's key and the action leading from it
+Parents = Dict[int, Tuple[Optional[int], Optional[RobotMove]]]
+
+# Most goal states the backward side of the bidirectional search starts from,
+# beyond that it finishes as a forward BFS
+BIDIRECTIONAL_GOAL_STATE_LIMIT = 1 << 14
+
 
 class GraphSearchAI(AI):
+    def __init__(
+        self,
+        game_interface: Optional[AIInterface] = None,
+        symmetry_reduction: bool = False,
+        heuristic_mode: str = "sum",
+        tt_size: int = 100_000,
+        tt_policy: str = "depth",
+        workers: int = os.cpu_count() or 1,
+        board: Optional[Board] = None,
+        monitor: Optional[SearchMonitor] = None,
+        cache: Optional[SolutionCache] = None,
+        tablebase: Optional[Tablebase] = None,
+        move_memo_size: int = 200_000,
+        anytime_weight: float = 2.0,
+        time_budget: Optional[float] = None,
+        node_budget: Optional[int] = None,
+        weight: float = 1.5,
+    ):
+        """
+        Parameters:
+        game_interface (Optional[AIInterface]): The interface to the game being solved.
+        symmetry_reduction (bool): If True, robots without a goal are treated as
+            interchangeable blockers, so states that only swap them are visited once.
+        heuristic_mode (str): How the A* heuristic combines the distances of
+            several goals, either "sum" or "max".
+        tt_size (int): Number of entries in the IDA* transposition table, 0 disables it.
+        tt_policy (str): Replacement policy of the transposition table, "depth" or "always".
+        workers (int): Number of worker processes used by the parallel BFS.
+        board (Optional[Board]): The board to solve when there is no game interface.
+        monitor (Optional[SearchMonitor]): Receives progress and timing of the searches.
+        cache (Optional[SolutionCache]): Solutions found before are loaded from it
+            instead of searched again, and new ones are stored in it.
+        tablebase (Optional[Tablebase]): Precomputed distances used by the "tablebase" ai_type.
+        move_memo_size (int): Number of robot move lists remembered by actions, 0 disables it.
+        anytime_weight (float): Weight of the heuristic in the anytime search, higher
+            finds a first solution sooner.
+        time_budget (Optional[float]): Seconds after which the anytime search returns
+            the best solution found so far.
+        node_budget (Optional[int]): Expanded states after which the anytime search
+            returns the best solution found so far.
+        weight (float): Factor the weighted_a_star and focal solutions may exceed
+            the optimal number of moves by, at least 1.
+        """
+        super().__init__(game_interface, board)
+        if heuristic_mode not in ("sum", "max"):
+            raise ValueError(f"Unknown heuristic mode: {heuristic_mode}")
+        if weight < 1:
+            raise ValueError(f"The weight must be at least 1, not {weight}")
+        self.symmetry_reduction = symmetry_reduction
+        self.heuristic_mode = heuristic_mode
+        self.tt_size = tt_size
+        self.tt_policy = tt_policy
+        self.workers = workers
+        self.stats = SearchStats()  # Counters of the last search
+        self.monitor = monitor
+        self.cache = cache
+        self.tablebase = tablebase
+        self.move_memo_size = move_memo_size
+        self.anytime_weight = anytime_weight
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.weight = weight
+
     def actions(self, robots_state: RobotsState) -> RobotMoves:
         """Returns a list of all possible actions for the robots in the current state.
 
@@ -27,17 +112,27 @@ class GraphSearchAI(AI):
         Returns:
         RobotMoves: A list of all possible actions for the robots in the current state.
         """
+        move_memo = None
+        if self.move_memo_size > 0:
+            move_memo = self.board.solver_context().get_move_memo(self.move_memo_size)
+
         available_actions: RobotMoves = []
         for robot_id, robot_pos in enumerate(robots_state):
             other_robots_positions = [
                 pos for i, pos in enumerate(robots_state) if i != robot_id
             ]
 
-            for move in Robot.available_moves(
-                robot_pos,
-                self.game_interface.game_instance.board,
-                other_robots_positions,
-            ):
+            if move_memo is None:
+                moves = Robot.available_moves(robot_pos, self.board, other_robots_positions)
+            else:
+                # Robots off the rays of this robot cannot change its moves
+                key = move_memo.key(robot_pos, other_robots_positions)
+                moves = move_memo.lookup(key)
+                if moves is None:
+                    moves = Robot.available_moves(robot_pos, self.board, list(key[1]))
+                    move_memo.store(key, moves)
+
+            for move in moves:
                 available_actions.append(RobotMove(robot_id, move))
 
         return available_actions
@@ -56,78 +151,320 @@ class GraphSearchAI(AI):
         new_robots_state[action.robot_id] = action.move.final_position
         return new_robots_state
 
+    def predecessors(
+        self, robots_state: RobotsState
+    ) -> List[Tuple[RobotsState, RobotMove]]:
+        """Returns every state that leads to the given state with a single action.
+
+        Parameters:
+        robots_state (RobotsState): The positions of all robots.
+
+        Returns:
+        List[Tuple[RobotsState, RobotMove]]: The previous states and the action that
+        turns each of them into the given state.
+        """
+        previous_states = []
+        for robot_id, robot_pos in enumerate(robots_state):
+            other_robots_positions = [
+                pos for i, pos in enumerate(robots_state) if i != robot_id
+            ]
+
+            for direction in Direction:
+                action = RobotMove(robot_id, AvailableMove(robot_pos, direction))
+                for previous_pos in Robot.previous_positions(
+                    robot_pos, direction, self.board, other_robots_positions
+                ):
+                    previous_state: RobotsState = robots_state.copy()
+                    previous_state[robot_id] = previous_pos
+                    previous_states.append((previous_state, action))
+
+        return previous_states
+
     def goal_test(self, robots_state: RobotsState) -> bool:
-        """Returns True if all robots are on a goal, False otherwise."""
-        return [
-            self.board.is_on_goal(pos, i) for i, pos in enumerate(robots_state)
-        ].count(True) == len(self.board.goals)
+        """Returns True if every goal has its robot on it, False otherwise."""
+        return all(
+            robot_number < len(robots_state) and robots_state[robot_number] == position
+            for robot_number, position in self.board.solver_context().goal_positions
+        )
 
     def path_cost(self) -> int:
         return 1
 
+    def report_progress(self):
+        """Calls the monitor's on_progress every progress_interval expanded states."""
+        if self.stats.expanded % self.monitor.progress_interval == 0:
+            self.monitor.on_progress(self.stats)
+
+    def timed_phase(self, name: str):
+        """Returns the method with the given name, wrapped to add its run time to the stats."""
+        method = getattr(type(self), name).__get__(self)
+
+        def timed(*args):
+            start_time = time.perf_counter()
+            try:
+                return method(*args)
+            finally:
+                phase_seconds = self.stats.phase_seconds
+                phase_seconds[name] = (
+                    phase_seconds.get(name, 0.0) + time.perf_counter() - start_time
+                )
+
+        return timed
+
+    def state_codec(self, robots_state: RobotsState) -> StateCodec:
+        """Returns the codec used to pack states of this board with the given number of robots."""
+        interchangeable = []
+        if self.symmetry_reduction:
+            goal_robots = {goal.robot_number for goal in self.board.goals}
+            interchangeable = [
+                robot_id
+                for robot_id in range(len(robots_state))
+                if robot_id not in goal_robots
+            ]
+        return StateCodec(self.board.board_size, len(robots_state), interchangeable)
+
+    @staticmethod
+    def build_path(parents: Parents, key: int) -> RobotMoves:
+        """Rebuilds the moves leading to a discovered state by following its parents.
+
+        Parameters:
+        parents (Parents): The parent entries recorded during the search.
+        key (int): The key of the state to rebuild the path to.
+
+        Returns:
+        RobotMoves: The moves from the initial state to the given state.
+        """
+        path = []
+        parent_key, action = parents[key]
+        while action is not None:
+            path.append(action)
+            parent_key, action = parents[parent_key]
+        path.reverse()
+        return RobotMoves(path)
+
     def heuristic(self, robots_state: RobotsState) -> int:
         """
         Calculates the heuristic cost of a given state.
         Robots without a goal is ignored in the calculation
 
+        Every goal robot needs at least as many moves as its distance in the
+        goal distance table of the board's solver context, so the estimate never overestimates. The
+        distances of the goals are combined using the heuristic_mode ("sum" or "max").
+
         Parameters:
             robots_state (RobotsState): The current state of the robots.
 
         Returns:
             int: The heuristic cost estimate to reach the goal from the current state.
         """
-        distance = 0
-        for robot_index, robot_position in enumerate(robots_state):     # Iterates each robot
-            if robot_index < len(self.board.goals):     # Only calculate distance for robots with a goal.
-                goal = self.board.goals[robot_index]    # Get goal for the individual robot
-
-                # Calculate distance between robot and goal.
-                distance = abs(robot_position[0] - goal.x) + abs(robot_position[1] - goal.y)
+        width = self.board.board_size[0]
+        distances = [
+            table[y * width + x]
+            for robot_number, table in self.board.solver_context().goal_tables
+            if robot_number < len(robots_state)
+            for x, y in [robots_state[robot_number]]
+        ]
 
-                # debug
-                #if robot_index == 0:
-                #    print(f"{robot_index} -> {robot_position}, Goal: ({goal.x}, {goal.y}), Distance: {distance}")
+        if not distances:
+            return 0
+        if self.heuristic_mode == "max":
+            return max(distances)
+        return sum(distances)   # Every move moves a single robot, so the distances add up
 
-        return distance   # Returns total distance
-
-    def solve_a_star(self, initial_state: RobotsState) -> Optional[RobotMoves]:
+    def solve_a_star(
+        self, initial_state: RobotsState, weight: float = 1.0, anytime: bool = False
+    ) -> Optional[RobotMoves]:
         """
         Solves the game using the A* and returns the solution.
 
+        With a weight above 1, states are ordered by cost + weight * heuristic
+        (weighted A*), which heads for the goal sooner and expands fewer states.
+        As the heuristic never overestimates, the solution has at most weight
+        times the optimal number of moves.
+
+        With anytime, the search goes on after a solution is found, looking for
+        shorter ones and skipping every state that cannot beat the best so far.
+        Each improvement is passed to the monitor's on_solution. The search stops
+        when no shorter solution is left, which proves the best one optimal, or
+        when the time_budget or node_budget runs out.
+
+        stats.lower_bound is set to the smallest cost + heuristic left in the
+        frontier (capped by the solution), which no solution can beat.
+
         References:
             https://www.redblobgames.com/pathfinding/a-star/implementation.html
             https://llego.dev/posts/implementing-the-a-search-algorithm-python/
 
         Parameters:
             initial_state (RobotsState): The initial state of the game.
+            weight (float): The weight of the heuristic, 1 for plain A*.
+            anytime (bool): Keep improving the solution until the budget runs out.
 
         Returns:
             Optional[RobotMoves]: The step-by-step solution to the game.
         """
         start_time = time.time()
-        frontier = [(0, (initial_state, RobotMoves([])))]   # Initialize priority queue with initial state
-        visited = {tuple(initial_state)}  # Set to keep track of visited states to avoid cycles.
-        moves_tried = 0     # Initialize counter for moves tried
+        deadline = None
+        if anytime and self.time_budget is not None:
+            deadline = time.perf_counter() + self.time_budget
+        node_budget = self.node_budget if anytime else None
+        codec = self.state_codec(initial_state)
+        initial_packed = codec.encode(initial_state)
+        initial_heuristic = self.heuristic(initial_state)
+        # Priority queue of (priority, packed state, cost so far, heuristic)
+        frontier = [(weight * initial_heuristic, initial_packed, 0, initial_heuristic)]
+        parents: Parents = {codec.canonical(initial_packed): (None, None)}  # Discovered states, used to avoid cycles.
+        costs = {codec.canonical(initial_packed): 0}    # Cheapest known cost of every discovered state
+        self.stats = SearchStats()     # Initialize counters for states expanded and moves tried
+        best: Optional[RobotMoves] = None
+        best_cost = math.inf
 
         while frontier:
+            if (node_budget is not None and self.stats.expanded >= node_budget) or (
+                deadline is not None and time.perf_counter() > deadline
+            ):
+                break
+
             # Get state with the lowest priority from the frontier (discovered but not yet explored paths)
-            priority, (current_state, path) = heappop(frontier)
+            _, current_packed, cost, current_heuristic = heappop(frontier)
+            current_key = codec.canonical(current_packed)
+            if cost > costs[current_key] or cost + current_heuristic >= best_cost:
+                continue    # Reached cheaper since it was queued, or cannot lead to a shorter solution
 
+            current_state = RobotsState(codec.decode(current_packed))
             if self.goal_test(current_state):
-                end_time = time.time()
-                print(f"Solution found in {end_time - start_time:.2f} seconds with total moves tried: {moves_tried}")
-                return path
+                best = self.build_path(parents, current_key)
+                best_cost = cost
+                if not anytime:
+                    print(f"Solution found in {time.time() - start_time:.2f} seconds with total moves tried: {self.stats.generated}")
+                    break
+                print(f"Solution with {cost} moves found after {time.time() - start_time:.2f} seconds")
+                if self.monitor is not None:
+                    self.monitor.on_solution(self.stats, best)
+                continue
 
+            self.stats.expanded += 1
+            if self.monitor is not None:
+                self.report_progress()
+            self.stats.peak_frontier = max(self.stats.peak_frontier, len(frontier) + 1)
             for action in self.actions(current_state):  # Iterate over actions
                 new_state = self.results(current_state, action)     # Get new state
-                if tuple(new_state) not in visited:  # Check if new state has not been visited
-                    visited.add(tuple(new_state))    # When navigating to new state, mark as visited
-                    cost_so_far = len(path) + 1      # Add cost to the move
-                    priority = cost_so_far + self.heuristic(new_state)  # Calculate priority using heuristic
+                new_packed = codec.encode(new_state)
+                new_key = codec.canonical(new_packed)
+                cost_so_far = cost + 1      # Add cost to the move
+                if cost_so_far < costs.get(new_key, cost_so_far + 1):  # Check if the state is new or reached cheaper
+                    new_heuristic = self.heuristic(new_state)
+                    if cost_so_far + new_heuristic >= best_cost:
+                        continue    # Pruned, it cannot lead to a shorter solution
+                    parents[new_key] = (current_key, action)    # Mark as visited and remember how we got here
+                    costs[new_key] = cost_so_far
+                    priority = cost_so_far + weight * new_heuristic  # Calculate priority using heuristic
 
                     # Add new state to frontier list
-                    heappush(frontier, (priority, (new_state, RobotMoves(path + [action]))))
-                    moves_tried += 1
+                    heappush(frontier, (priority, new_packed, cost_so_far, new_heuristic))
+                    self.stats.generated += 1
+                else:
+                    self.stats.duplicates += 1
+
+        # Every shorter solution has to pass through a state left in the frontier
+        lower_bound = min(
+            [best_cost] + [queued_cost + heuristic for _, _, queued_cost, heuristic in frontier]
+        )
+        if lower_bound != math.inf:
+            self.stats.lower_bound = int(lower_bound)
+        end_time = time.time()
+        if best is None:
+            print(f"Search concluded in {end_time - start_time:.2f} seconds with no solution found.")
+        elif anytime:
+            print(f"Search ended after {end_time - start_time:.2f} seconds, best solution: {best_cost} moves, lower bound: {self.stats.lower_bound}")
+        return best
+
+    def solve_focal(self, initial_state: RobotsState) -> Optional[RobotMoves]:
+        """Solves the game with focal search (A*-epsilon) and returns the solution.
+
+        Open states are ordered by f = cost + heuristic like in A*, but the state
+        expanded next is the one with the smallest heuristic among the focal
+        states, those with f at most weight times the smallest f of the open
+        states. The smallest f never exceeds the optimal number of moves, so the
+        solution has at most weight times as many moves as the optimal one.
+        stats.lower_bound is set to that smallest f when the goal is reached.
+
+        Parameters:
+            initial_state (RobotsState): The initial state of the game.
+
+        Returns:
+            Optional[RobotMoves]: The step-by-step solution to the game.
+        """
+        start_time = time.time()
+        codec = self.state_codec(initial_state)
+        initial_packed = codec.encode(initial_state)
+        initial_key = codec.canonical(initial_packed)
+        initial_heuristic = self.heuristic(initial_state)
+        parents: Parents = {initial_key: (None, None)}
+        costs = {initial_key: 0}
+        open_keys = {initial_key}  # States discovered at their cost but not expanded yet
+        open_counts = {initial_heuristic: 1}  # Number of open states by f
+        open_f = [initial_heuristic]  # Heap of the f values of open_counts, may hold stale values
+        f_min = initial_heuristic
+        # Focal states as (heuristic, -cost, packed state), deepest first among equal heuristics
+        focal = [(initial_heuristic, 0, initial_packed)]
+        waiting = []  # Open states above the focal limit as (f, heuristic, -cost, packed state)
+        self.stats = SearchStats()
+
+        while focal:
+            current_heuristic, negative_cost, current_packed = heappop(focal)
+            cost = -negative_cost
+            current_key = codec.canonical(current_packed)
+            if cost != costs[current_key] or current_key not in open_keys:
+                continue    # Expanded already, or a cheaper path was found after it was queued
+
+            current_state = RobotsState(codec.decode(current_packed))
+            if self.goal_test(current_state):
+                self.stats.lower_bound = f_min
+                end_time = time.time()
+                print(f"Solution found in {end_time - start_time:.2f} seconds with total moves tried: {self.stats.generated}")
+                return self.build_path(parents, current_key)
+
+            open_keys.remove(current_key)
+            open_counts[cost + current_heuristic] -= 1
+            self.stats.expanded += 1
+            if self.monitor is not None:
+                self.report_progress()
+            self.stats.peak_frontier = max(self.stats.peak_frontier, len(open_keys) + 1)
+            for action in self.actions(current_state):
+                new_state = self.results(current_state, action)
+                new_packed = codec.encode(new_state)
+                new_key = codec.canonical(new_packed)
+                cost_so_far = cost + 1
+                if cost_so_far < costs.get(new_key, cost_so_far + 1):
+                    new_heuristic = self.heuristic(new_state)
+                    if new_key in open_keys:
+                        open_counts[costs[new_key] + new_heuristic] -= 1
+                    else:
+                        open_keys.add(new_key)  # New, or reopened when reached cheaper
+                    parents[new_key] = (current_key, action)
+                    costs[new_key] = cost_so_far
+
+                    f = cost_so_far + new_heuristic
+                    open_counts[f] = open_counts.get(f, 0) + 1
+                    if open_counts[f] == 1:
+                        heappush(open_f, f)
+                    if f <= self.weight * f_min:
+                        heappush(focal, (new_heuristic, -cost_so_far, new_packed))
+                    else:
+                        heappush(waiting, (f, new_heuristic, -cost_so_far, new_packed))
+                    self.stats.generated += 1
+                else:
+                    self.stats.duplicates += 1
+
+            # The smallest f only grows, which lets waiting states into the focal list
+            while open_f and open_counts[open_f[0]] == 0:
+                heappop(open_f)
+            if not open_f:
+                break
+            f_min = open_f[0]
+            while waiting and waiting[0][0] <= self.weight * f_min:
+                heappush(focal, heappop(waiting)[1:])
 
         end_time = time.time()
         print(f"Search concluded in {end_time - start_time:.2f} seconds with no solution found.")
@@ -141,17 +478,20 @@ class GraphSearchAI(AI):
         """
         start_time = time.time()  # start the time
 
-        # Define a queue for BFS. Each element is a tuple (robots_state, path).
-        queue: deque[Tuple[RobotsState, RobotMoves]] = deque(
-            [(initial_state, RobotMoves([]))]
-        )
-        moves_tried = 0  # Initialize counter for moves tried
+        codec = self.state_codec(initial_state)
+        initial_packed = codec.encode(initial_state)
 
-        # Set to keep track of visited states to avoid cycles.
-        visited = set([tuple(initial_state)])
+        # Define a queue for BFS holding packed states.
+        queue: deque[int] = deque([initial_packed])
+        self.stats = SearchStats()  # Initialize counters for states expanded and moves tried
+
+        # Parent entry of every discovered state, also used to avoid cycles.
+        parents: Parents = {codec.canonical(initial_packed): (None, None)}
 
         while queue:
-            current_state, path = queue.popleft()
+            current_packed = queue.popleft()
+            current_state = RobotsState(codec.decode(current_packed))
+            current_key = codec.canonical(current_packed)
 
             # Draw updated positions (debugging purposes only)
             # for i, pos in enumerate(current_state):
@@ -162,23 +502,78 @@ class GraphSearchAI(AI):
             if self.goal_test(current_state):
                 end_time = time.time()  # Record the end time when the solution is found
                 print(
-                    f"Solution found in {end_time - start_time:.2f} seconds with total moves tried: {moves_tried}"
+                    f"Solution found in {end_time - start_time:.2f} seconds with total moves tried: {self.stats.generated}"
                 )
-                return path  # Found the solution
+                return self.build_path(parents, current_key)  # Found the solution
 
+            self.stats.expanded += 1
+            if self.monitor is not None:
+                self.report_progress()
+            self.stats.peak_frontier = max(self.stats.peak_frontier, len(queue) + 1)
             for action in self.actions(current_state):
                 new_state = self.results(current_state, action)
 
                 # Prevent revisiting already visited states.
-                if tuple(new_state) not in visited:
-                    visited.add(tuple(new_state))
-                    queue.append((new_state, RobotMoves(path + [action])))
-                    moves_tried += 1
+                new_packed = codec.encode(new_state)
+                new_key = codec.canonical(new_packed)
+                if new_key not in parents:
+                    parents[new_key] = (current_key, action)
+                    queue.append(new_packed)
+                    self.stats.generated += 1
+                else:
+                    self.stats.duplicates += 1
 
         # If the queue is empty and no solution was found
         end_time = time.time()  # Stop timer if no solution
         return None
 
+    def solve_parallel_bfs(self, initial_state: RobotsState) -> Optional[RobotMoves]:
+        """Solves the game using BFS spread over several worker processes.
+
+        Parameters:
+        initial_state (RobotsState): The initial state of the game.
+
+        Returns:
+        Optional[RobotMoves]: The step-by-step solution to the game, with the same
+        number of moves as solve_bfs.
+        """
+        codec = self.state_codec(initial_state)
+        self.stats = SearchStats()
+        solution = ParallelBFS(
+            self.board,
+            self.workers,
+            codec.interchangeable,
+            self.stats,
+            None if self.monitor is None else self.monitor.on_progress,
+            self.move_memo_size,
+        ).solve(initial_state)
+        if solution is None:
+            return None
+        return RobotMoves([RobotMove(robot_id, move) for robot_id, move in solution])
+
+    def solve_numpy_bfs(self, initial_state: RobotsState) -> Optional[RobotMoves]:
+        """Solves the game using BFS that expands whole layers with NumPy.
+
+        States are not reduced by symmetry here. Raises a ValueError when NumPy
+        is not installed.
+
+        Parameters:
+        initial_state (RobotsState): The initial state of the game.
+
+        Returns:
+        Optional[RobotMoves]: The step-by-step solution to the game, with the same
+        number of moves as solve_bfs.
+        """
+        self.stats = SearchStats()
+        solution = NumpyBFS(
+            self.board,
+            self.stats,
+            None if self.monitor is None else self.monitor.on_progress,
+        ).solve(initial_state)
+        if solution is None:
+            return None
+        return RobotMoves([RobotMove(robot_id, move) for robot_id, move in solution])
+
     def solve_dfs(self, initial_state: RobotsState) -> Optional[RobotMoves]:
         """Solves the game using DFS and returns the solution.
 
@@ -189,70 +584,558 @@ class GraphSearchAI(AI):
         Optional[RobotMoves]: The step-by-step solution to the game.
         """
         start_time = time.time()
-        stack = [(initial_state, RobotMoves([]))]
-        visited = set([tuple(initial_state)])
-        moves_tried = 0
+        codec = self.state_codec(initial_state)
+        initial_packed = codec.encode(initial_state)
+        stack = [initial_packed]
+        parents: Parents = {codec.canonical(initial_packed): (None, None)}
+        self.stats = SearchStats()
 
         while stack:
-            current_state, path = stack.pop()
+            current_packed = stack.pop()
+            current_state = RobotsState(codec.decode(current_packed))
+            current_key = codec.canonical(current_packed)
 
             if self.goal_test(current_state):
                 end_time = time.time()
                 print(
-                    f"Solution found in {end_time - start_time:.2f} seconds with total moves tried: {moves_tried}"
+                    f"Solution found in {end_time - start_time:.2f} seconds with total moves tried: {self.stats.generated}"
                 )
-                return path
+                return self.build_path(parents, current_key)
 
+            self.stats.expanded += 1
+            if self.monitor is not None:
+                self.report_progress()
+            self.stats.peak_frontier = max(self.stats.peak_frontier, len(stack) + 1)
             for action in self.actions(current_state):
                 new_state = self.results(current_state, action)
 
-                if tuple(new_state) not in visited:
-                    visited.add(tuple(new_state))
-                    stack.append((new_state, RobotMoves(path + [action])))
-                    moves_tried += 1
+                new_packed = codec.encode(new_state)
+                new_key = codec.canonical(new_packed)
+                if new_key not in parents:
+                    parents[new_key] = (current_key, action)
+                    stack.append(new_packed)
+                    self.stats.generated += 1
+                else:
+                    self.stats.duplicates += 1
 
         end_time = time.time()
         return None
 
+    def solve_tablebase(self, initial_state: RobotsState) -> Optional[RobotMoves]:
+        """Solves the game by descending the distances of the tablebase.
+
+        Every step takes an action leading to a state one move closer to the goal,
+        so the solution is optimal and found in O(solution length) steps.
+
+        Parameters:
+        initial_state (RobotsState): The initial state of the game.
+
+        Returns:
+        Optional[RobotMoves]: The step-by-step solution to the game.
+        """
+        if self.tablebase is None or not self.tablebase.matches(
+            self.board, len(initial_state)
+        ):
+            raise ValueError("No tablebase was built for this board and number of robots")
+
+        self.stats = SearchStats()
+        start_time = time.time()
+        distance = self.tablebase.distance(initial_state)
+        if distance is None:
+            return None
+
+        path = RobotMoves([])
+        state = initial_state
+        while distance > 0:
+            self.stats.expanded += 1
+            for action in self.actions(state):
+                self.stats.generated += 1
+                new_state = self.results(state, action)
+                if self.tablebase.distance(new_state) == distance - 1:
+                    path.append(action)
+                    state = new_state
+                    distance -= 1
+                    break
+            else:
+                # Only a corrupt tablebase has no successor one move closer
+                raise ValueError(
+                    f"The tablebase has no move from distance {distance} to {distance - 1}"
+                )
+
+        end_time = time.time()
+        print(
+            f"Solution found in {end_time - start_time:.2f} seconds with total moves tried: {self.stats.generated}"
+        )
+        return path
+
+    def solve_ida_star(self, initial_state: RobotsState) -> Optional[RobotMoves]:
+        """Solves the game using iterative-deepening A* and returns the solution.
+
+        Each iteration is a depth-first search that cuts off states whose cost plus
+        heuristic exceeds the bound, which then grows to the smallest cut-off value.
+        Only the current path is kept in memory, plus a fixed-size transposition
+        table that skips states already searched with at least the same budget.
+
+        Parameters:
+        initial_state (RobotsState): The initial state of the game.
+
+        Returns:
+        Optional[RobotMoves]: The step-by-step solution to the game.
+        """
+        start_time = time.time()
+        codec = self.state_codec(initial_state)
+        table = (
+            TranspositionTable(self.tt_size, self.tt_policy) if self.tt_size > 0 else None
+        )
+        bound = self.heuristic(initial_state)
+        self.stats = SearchStats()
+
+        if self.goal_test(initial_state):
+            return RobotMoves([])
+
+        while True:
+            solution, next_bound = self.ida_star_iteration(
+                initial_state, codec, bound, table
+            )
+            if solution is not None:
+                end_time = time.time()
+                print(
+                    f"Solution found in {end_time - start_time:.2f} seconds with total moves tried: {self.stats.generated}"
+                )
+                return solution
+            if next_bound is None:
+                return None  # Nothing was cut off, so the whole reachable space was searched
+            bound = next_bound
+
+    def ida_star_iteration(
+        self,
+        initial_state: RobotsState,
+        codec: StateCodec,
+        bound: int,
+        table: Optional[TranspositionTable],
+    ) -> Tuple[Optional[RobotMoves], Optional[int]]:
+        """Runs one bounded depth-first iteration of IDA*.
+
+        Returns:
+        Tuple[Optional[RobotMoves], Optional[int]]: The solution if one was found and
+        the smallest cost estimate that exceeded the bound (None if nothing was cut off).
+        """
+        initial_key = codec.canonical(codec.encode(initial_state))
+        path: List[RobotMove] = []
+        on_path = {initial_key}   # States on the current path, to avoid cycles
+        stack = [(initial_state, initial_key, iter(self.actions(initial_state)))]
+        self.stats.expanded += 1
+        if self.monitor is not None:
+            self.report_progress()
+        next_bound = None
+
+        while stack:
+            current_state, current_key, remaining_actions = stack[-1]
+            action = next(remaining_actions, None)
+            if action is None:
+                # All actions tried, backtrack
+                stack.pop()
+                on_path.discard(current_key)
+                if path:
+                    path.pop()
+                continue
+
+            new_state = self.results(current_state, action)
+            new_key = codec.canonical(codec.encode(new_state))
+            if new_key in on_path:
+                self.stats.duplicates += 1
+                continue
+
+            cost = len(path) + 1
+            estimate = cost + self.heuristic(new_state)
+            if estimate > bound:
+                if next_bound is None or estimate < next_bound:
+                    next_bound = estimate
+                continue
+
+            # Skip states already searched with at least the budget left now
+            if table is not None:
+                stored_budget = table.lookup(new_key)
+                if stored_budget is not None and stored_budget >= bound - cost:
+                    self.stats.duplicates += 1
+                    continue
+                table.store(new_key, bound - cost)
+
+            self.stats.generated += 1
+            if self.goal_test(new_state):
+                return RobotMoves(path + [action]), next_bound
+
+            path.append(action)
+            on_path.add(new_key)
+            stack.append((new_state, new_key, iter(self.actions(new_state))))
+            self.stats.expanded += 1
+            if self.monitor is not None:
+                self.report_progress()
+            self.stats.peak_frontier = max(self.stats.peak_frontier, len(stack))
+
+        return None, next_bound
+
+    def reach_distances(self, start: Tuple[int, int]) -> List[int]:
+        """Returns the fewest moves a lone robot needs from start to every cell.
+
+        Like the goal distance tables, the robot may stop on any cell of its
+        slides, since other robots could always block it there, so a robot that
+        makes m moves ends on a cell at most m away.
+
+        Returns:
+        List[int]: The distance of every cell, indexed by y * width + x. Cells that
+        cannot be reached get width * height.
+        """
+        width, height = self.board.board_size
+        ray_stops = self.board.solver_context().ray_stops
+        unreachable = width * height
+        distances = [unreachable] * (width * height)
+        distances[start[1] * width + start[0]] = 0
+        queue = deque([start])
+
+        while queue:
+            x, y = queue.popleft()
+            distance = distances[y * width + x] + 1
+            for direction in Direction:
+                dx, dy = direction.value
+                stop = ray_stops[direction][y * width + x]
+                cell_x, cell_y = x, y
+                while (cell_x, cell_y) != stop:
+                    cell_x, cell_y = cell_x + dx, cell_y + dy
+                    if distances[cell_y * width + cell_x] == unreachable:
+                        distances[cell_y * width + cell_x] = distance
+                        queue.append((cell_x, cell_y))
+        return distances
+
+    def goal_seeds(
+        self, reach: List[List[int]], budget: int
+    ) -> Optional[List[RobotsState]]:
+        """Returns the goal states a solution can end in when the other robots move at most budget times.
+
+        Parameters:
+        reach (List[List[int]]): The reach_distances of every robot from its start.
+        budget (int): The most moves the robots without the goal can make together.
+
+        Returns:
+        Optional[List[RobotsState]]: The goal states, the other robots placed on
+        every combination of cells within the budget, or None if there are more
+        than BIDIRECTIONAL_GOAL_STATE_LIMIT of them.
+        """
+        goal = self.board.goals[0]
+        width, height = self.board.board_size
+        goal_cell = (goal.x, goal.y)
+        # The cells every other robot can end on within the budget, nearest first
+        options = [
+            sorted(
+                (distances[y * width + x], (x, y))
+                for x in range(width)
+                for y in range(height)
+                if distances[y * width + x] <= budget and (x, y) != goal_cell
+            )
+            for robot_id, distances in enumerate(reach)
+            if robot_id != goal.robot_number
+        ]
+
+        seeds: List[RobotsState] = []
+        placed: List[Tuple[int, int]] = []
+
+        def place(index: int, remaining: int) -> bool:
+            # Place the robots from index on, False once there are too many seeds
+            if index == len(options):
+                state = placed.copy()
+                state.insert(goal.robot_number, goal_cell)
+                seeds.append(RobotsState(state))
+                return len(seeds) <= BIDIRECTIONAL_GOAL_STATE_LIMIT
+            for distance, cell in options[index]:
+                if distance > remaining:
+                    break
+                if cell in placed:
+                    continue
+                placed.append(cell)
+                within_limit = place(index + 1, remaining - distance)
+                placed.pop()
+                if not within_limit:
+                    return False
+            return True
+
+        if not place(0, budget):
+            return None
+        return seeds
+
+    def expand_layer(
+        self,
+        codec: StateCodec,
+        layer: List[int],
+        parents: Parents,
+        backward: bool,
+        other_parents: Optional[Parents],
+    ) -> Tuple[List[int], Optional[int]]:
+        """Expands one BFS layer of the bidirectional search.
+
+        Parameters:
+        codec (StateCodec): The codec of the packed states.
+        layer (List[int]): The packed states to expand.
+        parents (Parents): The parents of this side, extended with the new states.
+        backward (bool): Walk back through predecessors instead of forward through actions.
+        other_parents (Optional[Parents]): The states of the other side, or None to
+            stop at goal states instead.
+
+        Returns:
+        Tuple[List[int], Optional[int]]: The next layer, and the first new state
+        seen by the other side (or the first goal state), if any.
+        """
+        next_layer = []
+        for current_packed in layer:
+            current_state = RobotsState(codec.decode(current_packed))
+            self.stats.expanded += 1
+            if self.monitor is not None:
+                self.report_progress()
+            if backward:
+                neighbours = self.predecessors(current_state)
+            else:
+                neighbours = [
+                    (self.results(current_state, action), action)
+                    for action in self.actions(current_state)
+                ]
+            for new_state, action in neighbours:
+                new_packed = codec.encode(new_state)
+                if new_packed in parents:
+                    self.stats.duplicates += 1
+                    continue
+                parents[new_packed] = (current_packed, action)
+                next_layer.append(new_packed)
+                self.stats.generated += 1
+                if other_parents is None:
+                    if self.goal_test(new_state):
+                        return next_layer, new_packed
+                elif new_packed in other_parents:
+                    return next_layer, new_packed
+        return next_layer, None
+
+    def solve_bidirectional(self, initial_state: RobotsState) -> Optional[RobotMoves]:
+        """Solves a single-goal game by searching from both ends until the searches meet.
+
+        A robot that makes m moves ends at most m reach_distances away from its
+        start, so in a solution of L moves the robots without the goal move at
+        most L - h times, h being the goal robot's distance to the goal. For
+        every bound L, starting at h, the backward search starts from only the
+        goal states within that budget (goal_seeds) and walks back through
+        predecessors, while the forward search from the initial state is kept
+        between bounds. Whole BFS layers are expanded on the side with the
+        smaller frontier until the depths of both sides add up to L. No solution
+        is shorter than L, so the first meeting state gives an optimal solution.
+
+        Once there would be more than BIDIRECTIONAL_GOAL_STATE_LIMIT goal states,
+        the search finishes as a forward BFS. States are not reduced by symmetry here.
+
+        Parameters:
+        initial_state (RobotsState): The initial state of the game.
+
+        Returns:
+        Optional[RobotMoves]: The step-by-step solution to the game.
+        """
+        if len(self.board.goals) != 1:
+            raise ValueError("Bidirectional search needs a board with exactly one goal")
+
+        start_time = time.time()
+        codec = StateCodec(self.board.board_size, len(initial_state))
+        self.stats = SearchStats()
+
+        if self.goal_test(initial_state):
+            return RobotMoves([])
+        goal = self.board.goals[0]
+        if goal.robot_number >= len(initial_state):
+            return None
+
+        width = self.board.board_size[0]
+        reach = [self.reach_distances(position) for position in initial_state]
+        goal_x, goal_y = initial_state[goal.robot_number]
+        goal_distance = self.board.solver_context().goal_distances((goal.x, goal.y))[
+            goal_y * width + goal_x
+        ]
+
+        # Forward parents point towards the initial state, backward parents towards a goal state
+        initial_packed = codec.encode(initial_state)
+        forward_parents: Parents = {initial_packed: (None, None)}
+        forward_layer = [initial_packed]
+        forward_depth = 0
+        backward_parents: Parents = {}
+        bound = goal_distance  # No solution is shorter
+
+        meeting_key = None
+        while forward_layer and meeting_key is None:
+            seeds = self.goal_seeds(reach, bound - goal_distance)
+            if seeds is None:
+                break  # Too many goal states, finish forward only
+
+            backward_parents = {}
+            backward_layer = []
+            backward_depth = 0
+            for seed in seeds:
+                seed_packed = codec.encode(seed)
+                backward_parents[seed_packed] = (None, None)
+                backward_layer.append(seed_packed)
+                if seed_packed in forward_parents:
+                    meeting_key = seed_packed
+
+            while (
+                meeting_key is None
+                and forward_layer
+                and backward_layer
+                and forward_depth + backward_depth < bound
+            ):
+                self.stats.peak_frontier = max(
+                    self.stats.peak_frontier, len(forward_layer) + len(backward_layer)
+                )
+                if len(forward_layer) <= len(backward_layer):
+                    forward_layer, meeting_key = self.expand_layer(
+                        codec, forward_layer, forward_parents, False, backward_parents
+                    )
+                    forward_depth += 1
+                else:
+                    backward_layer, meeting_key = self.expand_layer(
+                        codec, backward_layer, backward_parents, True, forward_parents
+                    )
+                    backward_depth += 1
+            bound += 1
+
+        if meeting_key is None and forward_layer:
+            backward_parents = {}
+            while forward_layer and meeting_key is None:
+                self.stats.peak_frontier = max(self.stats.peak_frontier, len(forward_layer))
+                forward_layer, meeting_key = self.expand_layer(
+                    codec, forward_layer, forward_parents, False, None
+                )
+
+        if meeting_key is None:
+            return None
+
+        # Join the path to the meeting state with the path from it to the goal
+        path = self.build_path(forward_parents, meeting_key)
+        next_key, action = backward_parents.get(meeting_key, (None, None))
+        while action is not None:
+            path.append(action)
+            next_key, action = backward_parents[next_key]
+
+        end_time = time.time()
+        print(
+            f"Solution found in {end_time - start_time:.2f} seconds with total moves tried: {self.stats.generated}"
+        )
+        return path
+
     def solve(
         self, initial_state: RobotsState, ai_type: str = "bfs"
     ) -> Optional[RobotMoves]:
-        """Solves the game using either BFS or DFS and returns the solution.
+        """Solves the game using the chosen search algorithm and returns the solution.
 
         Parameters:
         initial_state (RobotsState): The initial state of the game.
-        bfs (bool): If True, uses BFS. Otherwise, uses DFS.
+        ai_type (str): One of "bfs", "parallel_bfs", "numpy_bfs", "dfs", "a_star",
+            "weighted_a_star", "focal", "anytime", "ida_star", "bidirectional"
+            or "tablebase".
 
         Returns:
         Optional[RobotMoves]: The step-by-step solution to the game.
         """
         print("solving with: " + ai_type)
-        if ai_type == 'bfs':
-            return self.solve_bfs(initial_state)
-        elif ai_type == 'dfs':
-            return self.solve_dfs(initial_state)
-        elif ai_type == 'a_star':
-            return self.solve_a_star(initial_state)
+        if self.cache is not None:
+            cached_type = ai_type
+            if ai_type in ("weighted_a_star", "focal"):
+                cached_type = f"{ai_type}:{self.weight}"  # The solution depends on the weight
+            cache_key = SolutionCache.key(self.board, initial_state, cached_type)
+            found, solution = self.cache.get(cache_key)
+            if found:
+                print("Solution loaded from the cache")
+                self.stats = SearchStats()  # Nothing was searched
+                if solution is None:
+                    return None
+                return RobotMoves([RobotMove(robot_id, move) for robot_id, move in solution])
 
-    @staticmethod
-    def build_solution_and_play(game_interface: AIInterface, ai_type: str = "bfs"):
-        """ """
-        ai = GraphSearchAI(game_interface)
-        initial_state = RobotsState(
-            [robot.position for robot in game_interface.game_instance.robots]
+        if self.monitor is not None:
+            self.monitor.on_start(ai_type)
+            if self.monitor.time_phases:
+                # Shadow the methods with timed versions for this search only
+                for name in PHASES:
+                    setattr(self, name, self.timed_phase(name))
+
+        move_memo = None
+        if self.move_memo_size > 0:
+            move_memo = self.board.solver_context().get_move_memo(self.move_memo_size)
+            memo_hits, memo_misses = move_memo.hits, move_memo.misses
+
+        try:
+            if ai_type == 'bfs':
+                solution = self.solve_bfs(initial_state)
+            elif ai_type == 'parallel_bfs':
+                solution = self.solve_parallel_bfs(initial_state)
+            elif ai_type == 'numpy_bfs':
+                solution = self.solve_numpy_bfs(initial_state)
+            elif ai_type == 'dfs':
+                solution = self.solve_dfs(initial_state)
+            elif ai_type == 'a_star':
+                solution = self.solve_a_star(initial_state)
+            elif ai_type == 'weighted_a_star':
+                solution = self.solve_a_star(initial_state, self.weight)
+            elif ai_type == 'focal':
+                solution = self.solve_focal(initial_state)
+            elif ai_type == 'anytime':
+                solution = self.solve_a_star(initial_state, self.anytime_weight, anytime=True)
+            elif ai_type == 'ida_star':
+                solution = self.solve_ida_star(initial_state)
+            elif ai_type == 'bidirectional':
+                solution = self.solve_bidirectional(initial_state)
+            elif ai_type == 'tablebase':
+                solution = self.solve_tablebase(initial_state)
+            else:
+                raise ValueError(f"Unknown ai_type: {ai_type}")
+        finally:
+            for name in PHASES:
+                self.__dict__.pop(name, None)
+
+        if move_memo is not None:
+            self.stats.move_memo_hits = move_memo.hits - memo_hits
+            self.stats.move_memo_misses = move_memo.misses - memo_misses
+        # A solution cut short by the anytime budget may not be the shortest one
+        proven = ai_type != "anytime" or self.stats.lower_bound is None or (
+            solution is not None and self.stats.lower_bound == len(solution)
         )
+        if self.cache is not None and proven:
+            self.cache.put(cache_key, solution)
+        if self.monitor is not None:
+            self.monitor.on_finish(self.stats, solution)
+        return solution
 
-        solution = ai.solve(initial_state, ai_type)
+    @staticmethod
+    def build_solution_and_play(
+        game_interface: AIInterface,
+        ai_type: str = "bfs",
+        symmetry_reduction: bool = False,
+        replay_delay_ms: int = 1000,
+        cache: Optional[SolutionCache] = None,
+    ) -> SolveJob:
+        """Solves the game shown in the UI in the background, then replays the solution.
 
-        if solution is None:
-            print("No solution found")
-            return
+        Returns immediately; a search or replay still running in the UI is cancelled first.
 
-        print(f"Found a solution with {len(solution)} steps")
+        Parameters:
+        game_interface (AIInterface): The interface to the game being shown.
+        ai_type (str): The algorithm passed to solve.
+        symmetry_reduction (bool): Treat robots without a goal as interchangeable.
+        replay_delay_ms (int): The pause between two replayed moves.
+        cache (Optional[SolutionCache]): Cache of solutions found before.
 
-        for robot_id, move in solution:
-            new_position, on_goal = game_interface.move_robot(robot_id, move.direction)
-            print(
-                f"Moving robot {robot_id} -> {move.direction.name}, final position: {new_position}. On goal: {['No', 'Yes'][on_goal]}"
-            )
-            time.sleep(1)
+        Returns:
+        SolveJob: The running job, which can be cancelled.
+        """
+        ui = game_interface.game_instance
+        if ui.solve_job is not None:
+            ui.solve_job.cancel()
+
+        job = SolveJob(game_interface, ai_type, replay_delay_ms)
+        ai = GraphSearchAI(
+            game_interface, symmetry_reduction, monitor=job.monitor, cache=cache
+        )
+        initial_state = RobotsState([robot.position for robot in ui.robots])
+        ui.solve_job = job
+        job.start(ai, initial_state)
+        return job
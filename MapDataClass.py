@@ -1,4 +1,19 @@
-from dataclasses import dataclass
+import json
+from dataclasses import asdict, dataclass, field
+from typing import List, Tuple
+
+# Colors of robots (and their goals) by robot_id
+ROBOT_COLORS = ["red", "blue", "green", "yellow", "purple", "orange", "cyan", "magenta"]
+
+# Size, robot starts and goals of maps that only list their walls
+DEFAULT_BOARD_SIZE = (16, 16)
+DEFAULT_ROBOT_POSITIONS: List[Tuple[int, int]] = [(2, 3), (3, 3), (4, 3)]
+
+
+def robot_color(robot_id: int) -> str:
+    if robot_id < len(ROBOT_COLORS):
+        return ROBOT_COLORS[robot_id]
+    return "gray"
 
 
 @dataclass
@@ -9,3 +24,86 @@ class WallData:
 
     def to_object(d: dict):
         return WallData(d["x_pos"], d["y_pos"], d["direction"])
+
+
+@dataclass
+class GoalData:
+    x_pos: int
+    y_pos: int
+    robot: int  # The robot_id of the robot that has to reach the goal
+
+
+DEFAULT_GOALS: List[GoalData] = [GoalData(0, 7, 0), GoalData(15, 0, 1)]
+
+
+@dataclass
+class MapData:
+    """Everything a map file describes: the walls, board size, robot starts and goals."""
+
+    walls: List[WallData]
+    board_size: Tuple[int, int] = DEFAULT_BOARD_SIZE
+    robots: List[Tuple[int, int]] = field(
+        default_factory=lambda: list(DEFAULT_ROBOT_POSITIONS)
+    )
+    goals: List[GoalData] = field(default_factory=lambda: list(DEFAULT_GOALS))
+
+    def validate(self):
+        """Raises a ValueError if the map has no goals, a robot or goal is off the
+        board or robots overlap."""
+        width, height = self.board_size
+        if width < 1 or height < 1:
+            raise ValueError(f"Invalid board size: {width}x{height}")
+        if not self.goals:
+            raise ValueError("The map has no goals")
+        for x, y in self.robots:
+            if not (0 <= x < width and 0 <= y < height):
+                raise ValueError(f"The robot at ({x}, {y}) is outside the board")
+        if len(set(self.robots)) != len(self.robots):
+            raise ValueError("Two robots start on the same cell")
+        for goal in self.goals:
+            if not (0 <= goal.x_pos < width and 0 <= goal.y_pos < height):
+                raise ValueError(f"The goal at ({goal.x_pos}, {goal.y_pos}) is outside the board")
+            if not 0 <= goal.robot < len(self.robots):
+                raise ValueError(f"The goal at ({goal.x_pos}, {goal.y_pos}) has no robot {goal.robot}")
+
+
+def load_map(path: str) -> MapData:
+    """Reads a JSON map file.
+
+    A map is either an object with "board_size", "robots", "goals" and "walls",
+    or, in the original format, just the list of walls, which gets a 16x16
+    board with the default robots and goals. Objects need "robots" and "goals",
+    without "board_size" the board is 16x16 and without "walls" it has none.
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+
+    if isinstance(data, list):
+        map_data = MapData([WallData.to_object(wall) for wall in data])
+    else:
+        for key in ("robots", "goals"):
+            if key not in data:
+                raise ValueError(f"{path} has no \"{key}\"")
+        map_data = MapData(
+            walls=[WallData.to_object(wall) for wall in data.get("walls", [])],
+            board_size=tuple(data.get("board_size", DEFAULT_BOARD_SIZE)),
+            robots=[tuple(position) for position in data["robots"]],
+            goals=[GoalData(**goal) for goal in data["goals"]],
+        )
+    map_data.validate()
+    return map_data
+
+
+def save_map(path: str, map_data: MapData):
+    """Writes a map to a JSON map file in the format read by load_map."""
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "board_size": list(map_data.board_size),
+                "robots": [list(position) for position in map_data.robots],
+                "goals": [asdict(goal) for goal in map_data.goals],
+                "walls": [asdict(wall) for wall in map_data.walls],
+            },
+            f,
+            indent=4,
+        )
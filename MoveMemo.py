@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from Wall import Direction
+
+if TYPE_CHECKING:
+    from Robot import AvailableMove
+
+# (robot cell, cells of the robots on its rays)
+MoveKey = Tuple[Tuple[int, int], Tuple[Tuple[int, int], ...]]
+
+
+class MoveMemo:
+    """A bounded cache of the moves of a robot, evicting the least recently used entry.
+
+    Only the robots lying on the four rays of a robot (between it and where it
+    would stop on an empty board) change its moves, so the moves are keyed on the
+    robot's cell and those blockers. States that only differ in robots elsewhere
+    on the board share the entry.
+
+    The memo lives in the board's shared SolverContext, and a cancelled search
+    thread can still be running while the next one starts, so lookups and stores
+    are serialized by a lock.
+    """
+
+    def __init__(
+        self,
+        ray_stops: Dict[Direction, List[Tuple[int, int]]],
+        board_size: Tuple[int, int],
+        max_size: int,
+    ):
+        if max_size <= 0:
+            raise ValueError("The move memo needs room for at least one entry")
+        self.ray_stops = ray_stops
+        self.width = board_size[0]
+        self.max_size = max_size
+        self.entries: "OrderedDict[MoveKey, List[AvailableMove]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(
+        self, current_position: Tuple[int, int], other_robots_positions: List[Tuple[int, int]]
+    ) -> MoveKey:
+        """Returns the robot cell and the sorted cells of the robots blocking its rays."""
+        x, y = current_position
+        cell = y * self.width + x
+        west_x = self.ray_stops[Direction.WEST][cell][0]
+        east_x = self.ray_stops[Direction.EAST][cell][0]
+        north_y = self.ray_stops[Direction.NORTH][cell][1]
+        south_y = self.ray_stops[Direction.SOUTH][cell][1]
+        blockers = sorted(
+            (other_x, other_y)
+            for other_x, other_y in other_robots_positions
+            if (other_y == y and west_x <= other_x <= east_x)
+            or (other_x == x and north_y <= other_y <= south_y)
+        )
+        return current_position, tuple(blockers)
+
+    def lookup(self, key: MoveKey) -> Optional[List["AvailableMove"]]:
+        """Returns the stored moves, or None if they are not stored."""
+        with self.lock:
+            moves = self.entries.get(key)
+            if moves is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return moves
+
+    def store(self, key: MoveKey, moves: List["AvailableMove"]):
+        with self.lock:
+            self.entries[key] = moves
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def __getstate__(self):
+        # Locks cannot be pickled or copied, e.g. when a board is sent to worker processes
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
@@ -0,0 +1,209 @@
+import time
+from typing import Callable, List, Optional, Tuple
+
+from Board import Board
+from Robot import AvailableMove
+from SearchStats import SearchStats
+from Wall import Direction
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only the "numpy_bfs" ai_type needs it
+    np = None
+
+# Above this many possible states, visited states are kept in a sorted array
+# instead of a flag per state
+DENSE_VISITED_LIMIT = 1 << 27
+
+
+class NumpyBFS:
+    """Breadth-first search that expands a whole layer at once with NumPy.
+
+    A state is the integer sum(cell_i * cells ** (robot_count - 1 - i)) with
+    cell_i = y * width + x, and a layer is an array of such integers, so
+    cells ** robot_count has to fit in an int64. For every
+    robot and direction, the slide of all states of the layer is computed at
+    once: the ray-stop table gives where the robot stops on an empty board, and
+    every other robot on the way moves the stop in front of it. New states are
+    deduplicated with np.unique and a visited flag per state (or a sorted array
+    of visited states on very large state spaces).
+    """
+
+    def __init__(
+        self,
+        board: Board,
+        stats: Optional[SearchStats] = None,
+        on_layer: Optional[Callable[[SearchStats], None]] = None,
+    ):
+        if np is None:
+            raise ValueError("The numpy_bfs algorithm needs NumPy to be installed")
+        self.board = board
+        self.stats = stats if stats is not None else SearchStats()
+        self.on_layer = on_layer  # Called with the stats after every layer
+
+        width, height = board.board_size
+        self.width = width
+        self.cells = width * height
+        ray_stops = board.solver_context().ray_stops
+        # Stop cell of every cell and direction on an empty board, as cell indices
+        self.stop_tables = {
+            direction: np.array(
+                [y * width + x for x, y in ray_stops[direction]], dtype=np.int64
+            )
+            for direction in Direction
+        }
+
+    def solve(
+        self, initial_state: List[Tuple[int, int]]
+    ) -> Optional[List[Tuple[int, AvailableMove]]]:
+        """Solves the game and returns the solution as (robot_id, move) pairs.
+
+        Parameters:
+        initial_state (List[Tuple[int, int]]): The positions of all robots.
+
+        Returns:
+        Optional[List[Tuple[int, AvailableMove]]]: The step-by-step solution to the game.
+        """
+        start_time = time.time()
+        robot_count = len(initial_state)
+        weights = [self.cells ** (robot_count - 1 - i) for i in range(robot_count)]
+        state_count = self.cells ** robot_count
+        if state_count >= 1 << 63:
+            raise ValueError(
+                f"The numpy_bfs algorithm packs states into 64-bit integers, too small for"
+                f" {robot_count} robots on {self.cells} cells"
+            )
+
+        initial = sum(
+            (y * self.width + x) * weight for (x, y), weight in zip(initial_state, weights)
+        )
+        layer = np.array([initial], dtype=np.int64)
+        if self.goal_mask(layer, weights)[0]:
+            return []
+
+        if state_count <= DENSE_VISITED_LIMIT:
+            visited_flags = np.zeros(state_count, dtype=np.bool_)
+            visited_flags[initial] = True
+        else:
+            visited_sorted = layer.copy()
+
+        # The states of every layer (sorted) and the state each one was reached from
+        layers: List[Tuple["np.ndarray", "np.ndarray"]] = [(layer, layer)]
+
+        while layer.size > 0:
+            self.stats.expanded += int(layer.size)
+            self.stats.peak_frontier = max(self.stats.peak_frontier, int(layer.size))
+
+            successors, parents = self.successors(layer, weights)
+            successor_count = int(successors.size)
+
+            # Keep the first parent of every new state
+            successors, first = np.unique(successors, return_index=True)
+            parents = parents[first]
+            if state_count <= DENSE_VISITED_LIMIT:
+                new = ~visited_flags[successors]
+                successors, parents = successors[new], parents[new]
+                visited_flags[successors] = True
+            else:
+                new = ~np.isin(successors, visited_sorted, assume_unique=True)
+                successors, parents = successors[new], parents[new]
+                visited_sorted = np.union1d(visited_sorted, successors)
+
+            self.stats.generated += int(successors.size)
+            self.stats.duplicates += successor_count - int(successors.size)
+            if self.on_layer is not None:
+                self.on_layer(self.stats)
+
+            layer = successors
+            layers.append((successors, parents))
+            goals = np.flatnonzero(self.goal_mask(layer, weights))
+            if goals.size > 0:
+                solution = self.build_solution(layers, int(layer[goals[0]]), weights)
+                end_time = time.time()
+                print(
+                    f"Solution found in {end_time - start_time:.2f} seconds with total moves tried: {self.stats.generated}"
+                )
+                return solution
+
+        return None
+
+    def goal_mask(self, layer, weights: List[int]):
+        # True for the states of the layer with every goal robot on its goal
+        mask = np.ones(layer.size, dtype=np.bool_)
+        for goal in self.board.goals:
+            if goal.robot_number >= len(weights):
+                return np.zeros(layer.size, dtype=np.bool_)
+            cells = (layer // weights[goal.robot_number]) % self.cells
+            mask &= cells == goal.y * self.width + goal.x
+        return mask
+
+    def successors(self, layer, weights: List[int]):
+        """Returns the successor of every state, robot and direction that moves, with its parent."""
+        robot_cells = [(layer // weight) % self.cells for weight in weights]
+        xs = [cells % self.width for cells in robot_cells]
+        ys = [cells // self.width for cells in robot_cells]
+
+        successors = []
+        parents = []
+        for robot_id, weight in enumerate(weights):
+            x, y = xs[robot_id], ys[robot_id]
+            others = [i for i in range(len(weights)) if i != robot_id]
+            for direction in Direction:
+                dx, dy = direction.value
+                stop = self.stop_tables[direction][robot_cells[robot_id]]
+
+                # Slide along x or y; a robot on the way stops the slide in front of it
+                if dx != 0:
+                    along, across, sign = x, y, dx
+                    stop_along = stop % self.width
+                else:
+                    along, across, sign = y, x, dy
+                    stop_along = stop // self.width
+                for other in others:
+                    other_along = xs[other] if dx != 0 else ys[other]
+                    other_across = ys[other] if dx != 0 else xs[other]
+                    in_the_way = (
+                        (other_across == across)
+                        & ((other_along - along) * sign > 0)
+                        & ((other_along - stop_along) * sign <= 0)
+                    )
+                    stop_along = np.where(in_the_way, other_along - sign, stop_along)
+
+                if dx != 0:
+                    final_cells = y * self.width + stop_along
+                else:
+                    final_cells = stop_along * self.width + x
+                moved = final_cells != robot_cells[robot_id]
+                successors.append(
+                    layer[moved] + (final_cells[moved] - robot_cells[robot_id][moved]) * weight
+                )
+                parents.append(layer[moved])
+
+        return np.concatenate(successors), np.concatenate(parents)
+
+    def build_solution(
+        self, layers, state: int, weights: List[int]
+    ) -> List[Tuple[int, AvailableMove]]:
+        # Follow the parents back through the layers, then turn every step into a move
+        path = [state]
+        for states, parents in reversed(layers[1:]):
+            state = int(parents[np.searchsorted(states, state)])
+            path.append(state)
+        path.reverse()
+
+        solution = []
+        for before, after in zip(path, path[1:]):
+            for robot_id, weight in enumerate(weights):
+                cell_before = (before // weight) % self.cells
+                cell_after = (after // weight) % self.cells
+                if cell_before == cell_after:
+                    continue
+                y_before, x_before = divmod(cell_before, self.width)
+                y_after, x_after = divmod(cell_after, self.width)
+                if x_after != x_before:
+                    direction = Direction.EAST if x_after > x_before else Direction.WEST
+                else:
+                    direction = Direction.SOUTH if y_after > y_before else Direction.NORTH
+                solution.append((robot_id, AvailableMove((x_after, y_after), direction)))
+                break
+        return solution
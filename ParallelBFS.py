@@ -0,0 +1,259 @@
+import multiprocessing
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from Board import Board
+from Robot import Robot, AvailableMove
+from SearchStats import SearchStats
+from StateCodec import StateCodec
+from Wall import Direction
+
+DIRECTIONS = list(Direction)
+
+# A successor sent between processes: (key, packed state, parent key, move code)
+# where the move code is robot_id * 4 + the index of the direction in DIRECTIONS
+Successor = Tuple[int, int, int, int]
+
+
+def reached_all_goals(board: Board, robots_state: List[Tuple[int, int]]) -> bool:
+    # Same test as GraphSearchAI.goal_test, usable without an AI instance
+    return all(
+        goal.robot_number < len(robots_state)
+        and robots_state[goal.robot_number] == (goal.x, goal.y)
+        for goal in board.goals
+    )
+
+
+def partition_worker(
+    partition: int,
+    workers: int,
+    board: Board,
+    robot_count: int,
+    interchangeable: Sequence[int],
+    move_memo_size: int,
+    connection,
+    inboxes: List["multiprocessing.Queue"],
+):
+    """Owns the visited states and the frontier of one partition of the state space.
+
+    A state belongs to partition key % workers. The worker answers the commands
+    sent by ParallelBFS over its end of a pipe until it is told to stop. The
+    successors of a layer go straight to the queue of the worker owning them,
+    so only counts pass through ParallelBFS.
+    """
+    codec = StateCodec(board.board_size, robot_count, interchangeable)
+    move_memo = None
+    if move_memo_size > 0:
+        move_memo = board.solver_context().get_move_memo(move_memo_size)
+    parents: Dict[int, Tuple[Optional[int], int]] = {}
+    frontier: List[int] = []  # Packed states of the current layer
+
+    def insert(successors: List[Successor], found: Optional[int]) -> Optional[int]:
+        # Keep the successors not seen before as the next layer and look for a goal
+        for new_key, new_packed, parent_key, move_code in successors:
+            if new_key in parents:
+                continue
+            parents[new_key] = (parent_key, move_code)
+            frontier.append(new_packed)
+            if found is None and reached_all_goals(board, codec.decode(new_packed)):
+                found = new_key
+        return found
+
+    while True:
+        command, argument = connection.recv()
+
+        if command == "expand":
+            # Generate the successors of the current layer, grouped by their owner
+            outboxes: List[List[Successor]] = [[] for _ in range(workers)]
+            for packed in frontier:
+                state = codec.decode(packed)
+                key = codec.canonical(packed)
+                for robot_id, robot_pos in enumerate(state):
+                    other_robots_positions = [
+                        pos for i, pos in enumerate(state) if i != robot_id
+                    ]
+                    if move_memo is None:
+                        moves = Robot.available_moves(robot_pos, board, other_robots_positions)
+                    else:
+                        # Same lookup as GraphSearchAI.actions
+                        memo_key = move_memo.key(robot_pos, other_robots_positions)
+                        moves = move_memo.lookup(memo_key)
+                        if moves is None:
+                            moves = Robot.available_moves(robot_pos, board, list(memo_key[1]))
+                            move_memo.store(memo_key, moves)
+                    for move in moves:
+                        new_state = state.copy()
+                        new_state[robot_id] = move.final_position
+                        new_packed = codec.encode(new_state)
+                        new_key = codec.canonical(new_packed)
+                        move_code = robot_id * 4 + DIRECTIONS.index(move.direction)
+                        outboxes[new_key % workers].append(
+                            (new_key, new_packed, key, move_code)
+                        )
+            frontier = []
+
+            # Hand the other partitions their successors, then take in ours
+            for owner, outbox in enumerate(outboxes):
+                if owner != partition:
+                    inboxes[owner].put(outbox)
+            successors = len(outboxes[partition])
+            found = insert(outboxes[partition], None)
+            for _ in range(workers - 1):
+                inbox = inboxes[partition].get()
+                successors += len(inbox)
+                found = insert(inbox, found)
+            connection.send((len(frontier), found, successors))
+
+        elif command == "insert":
+            connection.send((len(frontier), insert(argument, None), len(argument)))
+
+        elif command == "parent":
+            connection.send(parents[argument])
+
+        else:  # "stop"
+            connection.close()
+            return
+
+
+class ParallelBFS:
+    """Breadth-first search that expands every layer across worker processes.
+
+    The visited states and the frontier are partitioned by state key, so each
+    worker only deduplicates the states it owns. The board, with its wall index
+    and ray-stop tables already built, is handed to the workers when they are
+    forked and only read from there; each worker fills its own copy of the move
+    memo. Layers are processed in lock step, so the solution has the same number
+    of moves as the one found by solve_bfs.
+
+    Successors are exchanged between the workers directly, but every successor
+    owned by another worker is still pickled once by its sender and once by its
+    owner, and the layers are synchronized. On a single core, 1 worker is about
+    as fast as solve_bfs. The speedup from more workers is bounded by that
+    exchange and by the largest partition of each layer, and it has not been
+    measured on several cores.
+    """
+
+    def __init__(
+        self,
+        board: Board,
+        workers: int,
+        interchangeable: Sequence[int] = (),
+        stats: Optional[SearchStats] = None,
+        on_layer: Optional[Callable[[SearchStats], None]] = None,
+        move_memo_size: int = 200_000,
+    ):
+        self.board = board
+        self.workers = max(1, workers)
+        self.interchangeable = list(interchangeable)
+        self.stats = stats if stats is not None else SearchStats()
+        self.on_layer = on_layer  # Called with the stats after every layer
+        self.move_memo_size = move_memo_size  # Per worker, 0 disables it
+
+    def solve(
+        self, initial_state: List[Tuple[int, int]]
+    ) -> Optional[List[Tuple[int, AvailableMove]]]:
+        """Solves the game and returns the solution as (robot_id, move) pairs.
+
+        Parameters:
+        initial_state (List[Tuple[int, int]]): The positions of all robots.
+
+        Returns:
+        Optional[List[Tuple[int, AvailableMove]]]: The step-by-step solution to the game.
+        """
+        start_time = time.time()
+        if reached_all_goals(self.board, initial_state):
+            return []
+
+        # Build the tables before forking, so every worker shares them
+        self.board.solver_context()
+
+        codec = StateCodec(self.board.board_size, len(initial_state), self.interchangeable)
+        initial_packed = codec.encode(initial_state)
+        initial_key = codec.canonical(initial_packed)
+
+        connections = []
+        processes = []
+        inboxes = [multiprocessing.Queue() for _ in range(self.workers)]
+        for partition in range(self.workers):
+            parent_end, worker_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=partition_worker,
+                args=(
+                    partition,
+                    self.workers,
+                    self.board,
+                    len(initial_state),
+                    self.interchangeable,
+                    self.move_memo_size,
+                    worker_end,
+                    inboxes,
+                ),
+                daemon=True,
+            )
+            process.start()
+            connections.append(parent_end)
+            processes.append(process)
+
+        try:
+            # The initial state has no parent, marked by a negative move code
+            inbox = [(initial_key, initial_packed, initial_key, -1)]
+            connections[initial_key % self.workers].send(("insert", inbox))
+            connections[initial_key % self.workers].recv()  # Already checked for goals
+
+            layer_size = 1
+            while layer_size > 0:
+                self.stats.expanded += layer_size
+                self.stats.peak_frontier = max(self.stats.peak_frontier, layer_size)
+
+                # Expand the layer everywhere; the workers route the successors themselves
+                for connection in connections:
+                    connection.send(("expand", None))
+
+                # The owners reply with the size of their part of the next layer
+                replies = [connection.recv() for connection in connections]
+                layer_size = sum(frontier_size for frontier_size, _, _ in replies)
+                successors = sum(received for _, _, received in replies)
+                self.stats.generated += layer_size
+                self.stats.duplicates += successors - layer_size
+                if self.on_layer is not None:
+                    self.on_layer(self.stats)
+                found = next((key for _, key, _ in replies if key is not None), None)
+                if found is not None:
+                    solution = self.build_solution(initial_state, connections, found)
+                    end_time = time.time()
+                    print(
+                        f"Solution found in {end_time - start_time:.2f} seconds with total moves tried: {self.stats.generated}"
+                    )
+                    return solution
+
+            return None
+        finally:
+            for connection in connections:
+                connection.send(("stop", None))
+            for process in processes:
+                process.join()
+
+    def build_solution(
+        self, initial_state: List[Tuple[int, int]], connections, key: int
+    ) -> List[Tuple[int, AvailableMove]]:
+        # Follow the parent entries, asking the worker that owns each state
+        move_codes = []
+        while True:
+            connections[key % self.workers].send(("parent", key))
+            key, move_code = connections[key % self.workers].recv()
+            if move_code < 0:
+                break
+            move_codes.append(move_code)
+
+        # Replay the moves from the start to recover where each robot ends up
+        state = list(initial_state)
+        solution = []
+        for move_code in reversed(move_codes):
+            robot_id, direction_index = divmod(move_code, 4)
+            other_robots_positions = [pos for i, pos in enumerate(state) if i != robot_id]
+            direction = DIRECTIONS[direction_index]
+            state[robot_id] = Robot.find_final_position(
+                state[robot_id], direction, self.board, other_robots_positions
+            )
+            solution.append((robot_id, AvailableMove(state[robot_id], direction)))
+        return solution
@@ -0,0 +1,201 @@
+"""Seeded random boards and puzzles for stress testing the solvers.
+
+Walls follow the style of the bundled maps: L-shaped corners of two walls spread
+over the board, and short stubs sticking out of the outer edges. Robots start on
+random cells and the goals are placed where the robots end up after a random
+walk, so every puzzle is solvable in at most walk_length moves. Most short
+walks give puzzles of one or two moves; min_moves solves every puzzle with A*
+and draws again until the solution is at least that long.
+
+    python3 PuzzleGenerator.py --size 32x32 --robots 5 --seed 1 --output maps/large.json
+
+writes one random puzzle as a map file.
+"""
+import argparse
+import contextlib
+import random
+import sys
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from Board import Board
+from GraphSearchAI import GraphSearchAI, RobotsState
+from MapDataClass import GoalData, MapData, WallData, save_map
+from Robot import robot_color
+
+# Direction numbers used by WallData
+NORTH, SOUTH, EAST, WEST = 1, 2, 3, 4
+
+
+def random_walls(rng: random.Random, board_size: Tuple[int, int]) -> List[WallData]:
+    """Returns a wall layout in the style of the maps in maps/.
+
+    A 16x16 board gets 16 corners and 2 stubs per edge; other sizes get the same
+    density. Corners are never placed next to each other or on the outer cells.
+
+    Parameters:
+    rng (random.Random): The random generator.
+    board_size (Tuple[int, int]): The size of the board, at least 4x4.
+
+    Returns:
+    List[WallData]: The walls, one entry per wall.
+    """
+    width, height = board_size
+    if width < 4 or height < 4:
+        raise ValueError("Random boards need to be at least 4x4")
+    walls = []
+
+    # Stubs sticking out of every edge, perpendicular to it
+    for _ in range(max(1, width // 8)):
+        walls.append(WallData(rng.randrange(1, width - 1), 0, EAST))
+        walls.append(WallData(rng.randrange(1, width - 1), height - 1, EAST))
+    for _ in range(max(1, height // 8)):
+        walls.append(WallData(0, rng.randrange(1, height - 1), SOUTH))
+        walls.append(WallData(width - 1, rng.randrange(1, height - 1), SOUTH))
+
+    # L-shaped corners, one horizontal and one vertical wall on the same cell
+    corner_count = width * height // 16
+    taken = set()
+    attempts = 0
+    while len(taken) < corner_count and attempts < 100 * corner_count:
+        attempts += 1
+        x, y = rng.randrange(1, width - 1), rng.randrange(1, height - 1)
+        if any((x + dx, y + dy) in taken for dx in (-1, 0, 1) for dy in (-1, 0, 1)):
+            continue
+        taken.add((x, y))
+        walls.append(WallData(x, y, rng.choice([NORTH, SOUTH])))
+        walls.append(WallData(x, y, rng.choice([EAST, WEST])))
+    return walls
+
+
+def place_puzzle(
+    rng: random.Random,
+    board: Board,
+    robot_count: int,
+    walk_length: int,
+    goal_counts: Sequence[int] = (1, 2),
+    min_moves: int = 0,
+) -> RobotsState:
+    """Places robots on a board at random and its goals where a random walk ends.
+
+    The robots make walk_length random moves, and the first robots, as many as
+    drawn from goal_counts, get their goal at the cell they end on. The goals
+    already on the board are replaced.
+
+    Parameters:
+    rng (random.Random): The random generator.
+    board (Board): The board, with its walls.
+    robot_count (int): The number of robots.
+    walk_length (int): The number of random moves, an upper bound of the solution length.
+    goal_counts (Sequence[int]): The possible numbers of goals.
+    min_moves (int): The fewest moves of an optimal solution, at most walk_length.
+
+    Returns:
+    RobotsState: The robot start positions.
+    """
+    fewest_goals = min(min(goal_counts), robot_count)
+    if fewest_goals < 1:
+        raise ValueError("Every puzzle needs at least one goal")
+    if walk_length < fewest_goals:
+        # Otherwise no goal robot can leave its start and no puzzle is ever accepted
+        raise ValueError(f"walk_length must be at least {fewest_goals}")
+    if min_moves > walk_length:
+        raise ValueError("min_moves cannot exceed walk_length, which bounds the solution length")
+
+    width, height = board.board_size
+    cells = [(x, y) for x in range(width) for y in range(height)]
+    ai = GraphSearchAI(board=board)
+
+    while True:
+        robots = rng.sample(cells, robot_count)
+        state = RobotsState(list(robots))
+        for _ in range(walk_length):
+            state = ai.results(state, rng.choice(ai.actions(state)))
+
+        goal_robots = range(min(rng.choice(goal_counts), robot_count))
+        if any(state[robot_id] == robots[robot_id] for robot_id in goal_robots):
+            continue
+
+        board.clear_goals()
+        for robot_id in goal_robots:
+            x, y = state[robot_id]
+            board.add_goal(x, y, robot_id, robot_color(robot_id))
+        if min_moves <= 1:  # Every accepted puzzle needs at least one move
+            return RobotsState(robots)
+        with contextlib.redirect_stdout(sys.stderr):
+            solution = ai.solve(RobotsState(robots), "a_star")
+        if len(solution) >= min_moves:
+            return RobotsState(robots)
+
+
+def random_puzzles(
+    seed: int,
+    board_size: Tuple[int, int],
+    robot_count: int,
+    walk_length: int = 10,
+    goal_counts: Sequence[int] = (1, 2),
+    min_moves: int = 0,
+) -> Iterator[Tuple[Board, RobotsState]]:
+    """Yields an endless stream of random boards with robots and goals.
+
+    The same seed and arguments always give the same puzzles.
+    """
+    rng = random.Random(seed)
+    while True:
+        board = Board(board_size, goals=[])
+        board.load_walls(random_walls(rng, board_size))
+        initial_state = place_puzzle(
+            rng, board, robot_count, walk_length, goal_counts, min_moves
+        )
+        yield board, initial_state
+
+
+def random_map(
+    rng: random.Random,
+    board_size: Tuple[int, int],
+    robot_count: int,
+    walk_length: int = 10,
+    goal_counts: Sequence[int] = (1, 2),
+    min_moves: int = 0,
+) -> MapData:
+    """Returns a random puzzle as map data, ready to be saved as a map file."""
+    walls = random_walls(rng, board_size)
+    board = Board(board_size, goals=[])
+    board.load_walls(walls)
+    robots = place_puzzle(rng, board, robot_count, walk_length, goal_counts, min_moves)
+    goals = [GoalData(goal.x, goal.y, goal.robot_number) for goal in board.goals]
+    return MapData(walls, board_size, list(robots), goals)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Write a random puzzle as a map file.")
+    parser.add_argument("--size", default="16x16", help="Board size, e.g. 32x32")
+    parser.add_argument("--robots", type=int, default=4, help="Number of robots")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the puzzle")
+    parser.add_argument(
+        "--walk-length",
+        type=int,
+        default=10,
+        help="Number of random moves used to place the goals",
+    )
+    parser.add_argument(
+        "--min-moves",
+        type=int,
+        default=0,
+        help="Fewest moves of the optimal solution, at most --walk-length",
+    )
+    parser.add_argument("--output", required=True, help="The JSON map file to write")
+    args = parser.parse_args(argv)
+
+    width, _, height = args.size.partition("x")
+    board_size = (int(width), int(height or width))
+    rng = random.Random(args.seed)
+    save_map(
+        args.output,
+        random_map(
+            rng, board_size, args.robots, args.walk_length, min_moves=args.min_moves
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,18 @@
 from typing import Tuple, List
 
 from Board import Board
+from MapDataClass import DEFAULT_ROBOT_POSITIONS, robot_color
 from Wall import Direction
 from typing import NamedTuple
 
 
+# Start position and color of every robot of maps without robots, the index being its robot_id
+DEFAULT_ROBOTS: List[Tuple[Tuple[int, int], str]] = [
+    (position, robot_color(robot_id))
+    for robot_id, position in enumerate(DEFAULT_ROBOT_POSITIONS)
+]
+
+
 class AvailableMove(NamedTuple):
     final_position: Tuple[int, int]
     direction: Direction
@@ -62,29 +70,66 @@ class Robot:
         Returns:
         Tuple[int, int]: The final position of the robot after moving.
         """
-        final_position = current_position
-        moving = True
-        while moving:
-            x, y = final_position
-            dx, dy = direction.value
-            new_x, new_y = x + dx, y + dy
-
-            # Check if the new position is within the board boundaries
-            if 0 <= new_x < board.board_size[0] and 0 <= new_y < board.board_size[1]:
-
-                # Check if new position is not another robot and not blocked by a wall
-                if (new_x, new_y) not in other_robots_positions and not board.is_wall(
-                    final_position, (new_x, new_y)
-                ):
-                    final_position = (new_x, new_y)  # move the robot
-                else:
-                    moving = (
-                        False  # Stop moving if another robot or a wall blocks the path
-                    )
-            else:
-                moving = False  # Stop moving if the edge of the board is reached
-
-        return final_position
+        x, y = current_position
+        dx, dy = direction.value
+
+        # Start from where the robot would stop on an empty board
+        stop_x, stop_y = board.ray_stop(current_position, direction)
+
+        # Only robots between the robot and that cell can stop it earlier
+        for other_x, other_y in other_robots_positions:
+            if dx != 0 and other_y == y and 0 < (other_x - x) * dx <= (stop_x - x) * dx:
+                stop_x = other_x - dx
+            elif dy != 0 and other_x == x and 0 < (other_y - y) * dy <= (stop_y - y) * dy:
+                stop_y = other_y - dy
+
+        return (stop_x, stop_y)
+
+    @staticmethod
+    def previous_positions(
+        current_position: Tuple[int, int],
+        direction: Direction,
+        board: Board,
+        other_robots_positions: List[Tuple[int, int]],
+    ) -> List[Tuple[int, int]]:
+        """Return every position from which moving in a direction ends at the current position.
+
+        Parameters:
+        current_position (Tuple[int, int]): The position the robot ends at.
+        direction (Direction): The direction the robot moved in.
+        board (Board): The board object containing the walls and goals.
+        other_robots_positions (List[Tuple[int, int]]): The positions of the other robots.
+
+        Returns:
+        List[Tuple[int, int]]: The possible positions before the move, closest first.
+        """
+        x, y = current_position
+        dx, dy = direction.value
+
+        # The robot only stops here if the next cell is blocked
+        next_x, next_y = x + dx, y + dy
+        if (
+            0 <= next_x < board.board_size[0]
+            and 0 <= next_y < board.board_size[1]
+            and (next_x, next_y) not in other_robots_positions
+            and not board.is_wall(current_position, (next_x, next_y))
+        ):
+            return []
+
+        # Walk back along the ray until a robot, a wall or the edge is reached
+        previous_positions = []
+        previous_x, previous_y = x - dx, y - dy
+        while (
+            0 <= previous_x < board.board_size[0]
+            and 0 <= previous_y < board.board_size[1]
+            and (previous_x, previous_y) not in other_robots_positions
+            and not board.is_wall((previous_x, previous_y), (x, y))
+        ):
+            previous_positions.append((previous_x, previous_y))
+            x, y = previous_x, previous_y
+            previous_x, previous_y = x - dx, y - dy
+
+        return previous_positions
 
     def move(
         self,
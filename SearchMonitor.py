@@ -0,0 +1,58 @@
+import time
+from typing import List, Optional
+
+from SearchStats import SearchStats
+
+
+class SearchMonitor:
+    """Receives events from GraphSearchAI.solve while a search runs.
+
+    Subclass it and override the methods you need. on_progress is called every
+    progress_interval expanded states (once per layer for the parallel BFS). With
+    time_phases, the time spent in actions, results, goal_test, heuristic and
+    predecessors is added up in stats.phase_seconds. Without a monitor, the
+    solvers only keep their SearchStats counters up to date.
+
+    Raising SearchCancelled from on_progress stops the search; solve() lets the
+    exception through to the caller.
+    """
+
+    def __init__(self, progress_interval: int = 10_000, time_phases: bool = True):
+        self.progress_interval = progress_interval
+        self.time_phases = time_phases
+
+    def on_start(self, ai_type: str):
+        """Called before the search starts."""
+
+    def on_progress(self, stats: SearchStats):
+        """Called periodically with the counters of the running search."""
+
+    def on_solution(self, stats: SearchStats, solution: List):
+        """Called by the anytime search with every solution shorter than the ones before."""
+
+    def on_finish(self, stats: SearchStats, solution: Optional[List]):
+        """Called with the final counters and the solution (None if none was found)."""
+
+
+class SearchCancelled(Exception):
+    """Raised from a monitor callback to stop the running search."""
+
+
+class DeadlineMonitor(SearchMonitor):
+    """Stops a search with SearchCancelled once it has run for the given seconds.
+
+    The deadline is only checked every progress_interval expanded states, so a
+    search can overrun it by the time it takes to expand that many states.
+    """
+
+    def __init__(self, seconds: float, progress_interval: int = 1_000):
+        super().__init__(progress_interval, time_phases=False)
+        self.seconds = seconds
+        self.deadline = float("inf")
+
+    def on_start(self, ai_type: str):
+        self.deadline = time.perf_counter() + self.seconds
+
+    def on_progress(self, stats: SearchStats):
+        if time.perf_counter() > self.deadline:
+            raise SearchCancelled(f"No solution within {self.seconds} seconds")
@@ -0,0 +1,21 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass
+class SearchStats:
+    """Counters collected by a solver during a single search."""
+
+    expanded: int = 0  # States whose actions were generated
+    generated: int = 0  # New states added to the frontier (the "moves tried")
+    duplicates: int = 0  # Generated states that had already been seen
+    peak_frontier: int = 0  # Most states waiting in the frontier at once
+    move_memo_hits: int = 0  # Robot move lists taken from the move memo
+    move_memo_misses: int = 0  # Robot move lists that had to be computed
+    # Proven minimum number of moves of any solution, set by the A* variants
+    # (plain, weighted and anytime) and focal search
+    lower_bound: Optional[int] = None
+
+    # Seconds spent in each phase (actions, results, ...), only filled in when a
+    # SearchMonitor asks for phase timing
+    phase_seconds: Dict[str, float] = field(default_factory=dict)
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import List, Optional, Tuple
+
+from Board import Board
+from Robot import AvailableMove
+from Wall import Direction
+
+DEFAULT_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "ricochet_robots", "solutions.sqlite"
+)
+
+# Bump when the key or the stored format changes, so old entries are never used
+FORMAT_VERSION = 2
+
+
+class SolutionCache:
+    """Stores solutions on disk, keyed by a hash of the puzzle and the algorithm.
+
+    The key covers the board size, every wall, every goal, the robot positions
+    and the algorithm, so editing a map file simply produces new keys and the
+    stale entries are never read again. They age out through the least recently
+    used eviction, which keeps at most max_entries solutions in the file.
+
+    Every call opens its own sqlite connection, so a cache can be shared by a
+    UI and its solver thread, or by several processes of a batch run.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, max_entries: int = 10_000):
+        if max_entries <= 0:
+            raise ValueError("The solution cache needs room for at least one entry")
+        self.path = path
+        self.max_entries = max_entries
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS solutions"
+                " (key TEXT PRIMARY KEY, solution TEXT, last_used REAL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)"
+            )
+
+    def connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def key(board: Board, robots_state: List[Tuple[int, int]], ai_type: str) -> str:
+        """Returns the cache key of a puzzle solved with the given algorithm.
+
+        Parameters:
+        board (Board): The board with its walls and goals.
+        robots_state (List[Tuple[int, int]]): The positions of all robots.
+        ai_type (str): The algorithm, since e.g. DFS returns different solutions.
+
+        Returns:
+        str: A hex digest that only depends on the contents of the puzzle.
+        """
+        description = json.dumps(
+            [
+                FORMAT_VERSION,
+                board.fingerprint().hex(),
+                [list(position) for position in robots_state],
+                ai_type,
+            ]
+        )
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def get(
+        self, key: str
+    ) -> Tuple[bool, Optional[List[Tuple[int, AvailableMove]]]]:
+        """Returns whether the key is stored and, if so, its solution (None if unsolvable)."""
+        with closing(self.connect()) as connection, connection:
+            row = connection.execute(
+                "SELECT solution FROM solutions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            connection.execute(
+                "UPDATE solutions SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+
+        self.hits += 1
+        moves = json.loads(row[0])
+        if moves is None:
+            return True, None
+        return True, [
+            (robot_id, AvailableMove((x, y), Direction[direction]))
+            for robot_id, direction, x, y in moves
+        ]
+
+    def put(self, key: str, solution: Optional[List[Tuple[int, AvailableMove]]]):
+        """Stores a solution, evicting the least recently used entries beyond max_entries."""
+        moves = None
+        if solution is not None:
+            moves = [
+                [robot_id, move.direction.name, *move.final_position]
+                for robot_id, move in solution
+            ]
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)",
+                (key, json.dumps(moves), time.time()),
+            )
+            connection.execute(
+                "DELETE FROM solutions WHERE key IN (SELECT key FROM solutions"
+                " ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        with closing(self.connect()) as connection, connection:
+            connection.execute("DELETE FROM solutions")
@@ -0,0 +1,122 @@
+import threading
+from typing import TYPE_CHECKING, List, Optional
+
+from SearchMonitor import SearchCancelled, SearchMonitor
+from SearchStats import SearchStats
+
+if TYPE_CHECKING:
+    from AIInterface import AIInterface
+    from GraphSearchAI import GraphSearchAI, RobotsState
+
+
+class CancellableMonitor(SearchMonitor):
+    """Publishes the progress of a search to its SolveJob and stops it when cancelled."""
+
+    def __init__(self, job: "SolveJob", progress_interval: int = 1_000):
+        super().__init__(progress_interval, time_phases=False)
+        self.job = job
+
+    def on_progress(self, stats: SearchStats):
+        if self.job.cancel_event.is_set():
+            raise SearchCancelled()
+        self.job.progress = stats
+
+
+class SolveJob:
+    """Solves on a background thread and replays the solution on the Tk main loop.
+
+    The search runs on a worker thread and never touches tkinter. The main loop
+    polls the thread with master.after, shows its progress in the UI and, once a
+    solution is found, plays one move every replay_delay_ms milliseconds, so the
+    window keeps responding during both the search and the replay.
+    """
+
+    POLL_MS = 100  # How often the main loop checks on the search
+
+    def __init__(
+        self,
+        game_interface: "AIInterface",
+        ai_type: str = "bfs",
+        replay_delay_ms: int = 1000,
+    ):
+        self.game_interface = game_interface
+        self.ui = game_interface.game_instance
+        self.ai_type = ai_type
+        self.replay_delay_ms = replay_delay_ms
+
+        self.cancel_event = threading.Event()
+        self.monitor = CancellableMonitor(self)
+        self.progress: Optional[SearchStats] = None  # Latest stats of the running search
+        self.solution: Optional[List] = None
+        self.error: Optional[Exception] = None
+        self.finished = False  # Set once the replay is over or the job was stopped
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self, ai: "GraphSearchAI", initial_state: "RobotsState"):
+        """Starts solving initial_state with ai, whose monitor must be self.monitor."""
+        self.thread = threading.Thread(
+            target=self.run, args=(ai, initial_state), daemon=True
+        )
+        self.thread.start()
+        self.ui.show_status(f"Solving with {self.ai_type}...")
+        self.ui.master.after(self.POLL_MS, self.poll)
+
+    def run(self, ai: "GraphSearchAI", initial_state: "RobotsState"):
+        # Worker thread: only stores the outcome, the main loop picks it up in poll
+        try:
+            self.solution = ai.solve(initial_state, self.ai_type)
+        except SearchCancelled:
+            pass
+        except Exception as error:
+            self.error = error
+
+    def cancel(self):
+        """Stops the search or the replay at the next progress report or move."""
+        self.cancel_event.set()
+
+    def poll(self):
+        if self.thread.is_alive():
+            if self.progress is not None:
+                self.show_status(
+                    f"Solving with {self.ai_type}: {self.progress.expanded} states expanded,"
+                    f" {self.progress.generated} generated"
+                )
+            self.ui.master.after(self.POLL_MS, self.poll)
+            return
+
+        if self.cancel_event.is_set():
+            self.finish("Search cancelled")
+        elif self.error is not None:
+            self.finish(f"Search failed: {self.error}")
+        elif self.solution is None:
+            print("No solution found")
+            self.finish("No solution found")
+        else:
+            print(f"Found a solution with {len(self.solution)} steps")
+            self.replay(0)
+
+    def replay(self, step: int):
+        if self.cancel_event.is_set():
+            self.finish("Replay cancelled")
+            return
+        if step == len(self.solution):
+            self.finish(f"Solved in {len(self.solution)} moves")
+            return
+
+        robot_id, move = self.solution[step]
+        new_position, on_goal = self.game_interface.move_robot(robot_id, move.direction)
+        print(
+            f"Moving robot {robot_id} -> {move.direction.name}, final position: {new_position}. On goal: {['No', 'Yes'][on_goal]}"
+        )
+        self.show_status(f"Replaying move {step + 1} of {len(self.solution)}")
+        self.ui.master.after(self.replay_delay_ms, self.replay, step + 1)
+
+    def finish(self, status: str):
+        self.finished = True
+        self.show_status(status)
+
+    def show_status(self, text: str):
+        # A cancelled job keeps polling until its thread ends, by then the status
+        # line may belong to the job that replaced it
+        if self.ui.solve_job is self:
+            self.ui.show_status(text)
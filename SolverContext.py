@@ -0,0 +1,125 @@
+from collections import deque
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from MoveMemo import MoveMemo
+from Wall import DIRECTION_BITS, Direction
+
+if TYPE_CHECKING:
+    from Board import Board
+
+
+class SolverContext:
+    """Precomputed tables of a board, shared by every solve on it.
+
+    A context is built once per board version by Board.solver_context and
+    reused across solves, resets and algorithms. Adding a wall or a goal bumps
+    the board's version and drops the context, so the tables are rebuilt on the
+    next solve and never go stale. When only the goals changed, the tables that
+    just depend on the walls are taken over from the previous context.
+
+    It holds the ray-stop tables (the cell where a lone robot stops for every
+    cell and direction), the goal-distance tables used by the A* heuristic, and
+    the distance table of every goal of the board, paired with its robot, and
+    the memo of robot moves shared by all solvers.
+    """
+
+    def __init__(self, board: "Board", previous: Optional["SolverContext"] = None):
+        self.board_size = board.board_size
+        self.version = board.version
+        self.wall_version = board.wall_version
+        self.wall_index = board.wall_index  # Per-cell bitmask of blocked directions
+
+        if previous is not None and previous.wall_version == board.wall_version:
+            self.ray_stops = previous.ray_stops
+            self.distance_tables = previous.distance_tables
+            self.move_memo = previous.move_memo
+        else:
+            self.ray_stops: Dict[Direction, List[Tuple[int, int]]] = self.build_ray_stops()
+            # Move-distance tables towards goal cells, built on demand
+            self.distance_tables: Dict[Tuple[int, int], List[int]] = {}
+            self.move_memo: Optional[MoveMemo] = None  # Created by get_move_memo
+
+        # (robot_number, goal cell) and (robot_number, distance table) of every goal
+        self.goal_positions: List[Tuple[int, Tuple[int, int]]] = [
+            (goal.robot_number, (goal.x, goal.y)) for goal in board.goals
+        ]
+        self.goal_tables: List[Tuple[int, List[int]]] = [
+            (goal.robot_number, self.goal_distances((goal.x, goal.y)))
+            for goal in board.goals
+        ]
+
+    def get_move_memo(self, max_size: int) -> MoveMemo:
+        """Returns the move memo of the board, replacing it when the size limit changes."""
+        if self.move_memo is None or self.move_memo.max_size != max_size:
+            self.move_memo = MoveMemo(self.ray_stops, self.board_size, max_size)
+        return self.move_memo
+
+    def build_ray_stops(self) -> Dict[Direction, List[Tuple[int, int]]]:
+        # For every direction, fill in the stop cells starting from the far edge,
+        # so each cell can reuse the stop of the neighbour it slides into
+        width, height = self.board_size
+        ray_stops = {}
+        for direction in Direction:
+            dx, dy = direction.value
+            bit = DIRECTION_BITS[direction]
+            stops: List[Tuple[int, int]] = [(0, 0)] * (width * height)
+            xs = range(width - 1, -1, -1) if dx > 0 else range(width)
+            ys = range(height - 1, -1, -1) if dy > 0 else range(height)
+            for y in ys:
+                for x in xs:
+                    next_x, next_y = x + dx, y + dy
+                    if (
+                        0 <= next_x < width
+                        and 0 <= next_y < height
+                        and not self.wall_index[y * width + x] & bit
+                    ):
+                        stops[y * width + x] = stops[next_y * width + next_x]
+                    else:
+                        stops[y * width + x] = (x, y)
+            ray_stops[direction] = stops
+        return ray_stops
+
+    def goal_distances(self, goal_position: Tuple[int, int]) -> List[int]:
+        """Returns the minimum number of moves a lone robot needs to reach a goal cell.
+
+        The table is built by a reverse BFS from the goal. A robot is allowed to stop
+        on any cell of its ray, since other robots could always be placed as blockers,
+        so the distances never overestimate the real number of moves.
+
+        Parameters:
+        goal_position (Tuple[int, int]): The goal cell.
+
+        Returns:
+        List[int]: The distance for every cell, indexed by y * width + x. Cells that
+        cannot reach the goal get width * height.
+        """
+        if goal_position in self.distance_tables:
+            return self.distance_tables[goal_position]
+
+        width, height = self.board_size
+        unreachable = width * height
+        distances = [unreachable] * (width * height)
+        goal_x, goal_y = goal_position
+        distances[goal_y * width + goal_x] = 0
+        queue = deque([goal_position])
+
+        while queue:
+            x, y = queue.popleft()
+            distance = distances[y * width + x] + 1
+            for direction in Direction:
+                # Walk back along the cells that slide into (x, y) moving in this direction
+                dx, dy = direction.value
+                bit = DIRECTION_BITS[direction]
+                from_x, from_y = x - dx, y - dy
+                while (
+                    0 <= from_x < width
+                    and 0 <= from_y < height
+                    and not self.wall_index[from_y * width + from_x] & bit
+                ):
+                    if distances[from_y * width + from_x] == unreachable:
+                        distances[from_y * width + from_x] = distance
+                        queue.append((from_x, from_y))
+                    from_x, from_y = from_x - dx, from_y - dy
+
+        self.distance_tables[goal_position] = distances
+        return distances
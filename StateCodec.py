@@ -0,0 +1,98 @@
+from typing import List, Sequence, Tuple
+
+
+class StateCodec:
+    """Packs the positions of all robots into a single integer.
+
+    Every robot gets a fixed number of bits holding its cell index, enough for
+    the whole board (8 bits on a 16x16 board). Robot 0 is stored in the most
+    significant bits, so packed states order the same way as the position lists.
+
+    Robots listed as interchangeable (robots without a goal) only act as blockers,
+    so canonical() sorts their cells to map states that just swap them to one key.
+    """
+
+    def __init__(
+        self,
+        board_size: Tuple[int, int],
+        robot_count: int,
+        interchangeable: Sequence[int] = (),
+    ):
+        self.board_size = board_size
+        self.robot_count = robot_count
+        width, height = board_size
+
+        # Bits needed to store the index of any cell on the board
+        self.bits_per_robot = max(1, (width * height - 1).bit_length())
+        self.mask = (1 << self.bits_per_robot) - 1
+
+        # Cell index -> position lookup used when decoding
+        self.cells: List[Tuple[int, int]] = [
+            (x, y) for x in range(width) for y in range(height)
+        ]
+
+        # Bit offsets of the interchangeable robots, only worth sorting with two or more
+        self.interchangeable: List[int] = []
+        self.interchangeable_shifts: List[int] = []
+        if len(interchangeable) > 1:
+            self.interchangeable = list(interchangeable)
+            self.interchangeable_shifts = sorted(
+                (robot_count - 1 - robot_id) * self.bits_per_robot
+                for robot_id in interchangeable
+            )
+        self.interchangeable_mask = 0
+        for shift in self.interchangeable_shifts:
+            self.interchangeable_mask |= self.mask << shift
+
+    def cell_index(self, position: Tuple[int, int]) -> int:
+        return position[0] * self.board_size[1] + position[1]
+
+    def encode(self, robots_state: List[Tuple[int, int]]) -> int:
+        """Returns the packed integer for the given robot positions.
+
+        Parameters:
+        robots_state (List[Tuple[int, int]]): The positions of all robots.
+
+        Returns:
+        int: The positions packed into a single integer.
+        """
+        height = self.board_size[1]
+        packed = 0
+        for x, y in robots_state:
+            packed = (packed << self.bits_per_robot) | (x * height + y)
+        return packed
+
+    def decode(self, packed: int) -> List[Tuple[int, int]]:
+        """Returns the robot positions stored in a packed integer.
+
+        Parameters:
+        packed (int): A state packed with encode.
+
+        Returns:
+        List[Tuple[int, int]]: The positions of all robots.
+        """
+        robots_state = [None] * self.robot_count
+        for robot_id in range(self.robot_count - 1, -1, -1):
+            robots_state[robot_id] = self.cells[packed & self.mask]
+            packed >>= self.bits_per_robot
+        return robots_state
+
+    def canonical(self, packed: int) -> int:
+        """Returns the key of a packed state, with the interchangeable robots in sorted order.
+
+        Parameters:
+        packed (int): A state packed with encode.
+
+        Returns:
+        int: The packed state itself when no robots are interchangeable.
+        """
+        if not self.interchangeable_shifts:
+            return packed
+
+        fields = sorted(
+            (packed >> shift) & self.mask for shift in self.interchangeable_shifts
+        )
+        packed &= ~self.interchangeable_mask
+        for shift, field in zip(self.interchangeable_shifts, fields):
+            packed |= field << shift
+        return packed
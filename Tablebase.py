@@ -0,0 +1,203 @@
+"""Distance to the goal of every state of a board, like an endgame tablebase.
+
+    python3 Tablebase.py maps/easy.json --robots 2 --output easy.rrtb
+
+runs a retrograde BFS from every goal state over the whole state space and
+writes one byte per state. GraphSearchAI then solves any start position on that
+board optimally by always moving to a state one step closer to the goal.
+"""
+import argparse
+import mmap
+import struct
+import time
+from itertools import permutations
+from typing import List, Optional, Tuple
+
+from Board import Board
+from Wall import DIRECTION_BITS, Direction
+
+MAGIC = b"RRTB"
+VERSION = 1
+# Magic, version, board width and height, robot count and the board fingerprint
+HEADER = struct.Struct("<4sBBBB32s")
+
+UNREACHABLE = 255  # Distance byte of states that cannot reach the goal
+
+
+class Tablebase:
+    """The distance to the goal of every placement of robot_count robots on a board.
+
+    A state is stored at index sum(cell_i * cells ** (robot_count - 1 - i)), with
+    cell_i = y * width + x the cell of robot i, so the table has one byte for each
+    of the cells ** robot_count placements: 64 KiB for 2 robots and 16 MiB for 3
+    robots on a 16x16 board. Placements with two robots on one cell, and states
+    that cannot reach the goal, hold UNREACHABLE.
+    """
+
+    def __init__(self, board: Board, robot_count: int, distances):
+        self.board_size = board.board_size
+        self.robot_count = robot_count
+        self.fingerprint = board.fingerprint()
+        self.distances = distances  # A bytearray, or the mmap of a tablebase file
+        self.cells = board.board_size[0] * board.board_size[1]
+
+    def index(self, robots_state: List[Tuple[int, int]]) -> int:
+        width = self.board_size[0]
+        index = 0
+        for x, y in robots_state:
+            index = index * self.cells + y * width + x
+        return index
+
+    def distance(self, robots_state: List[Tuple[int, int]]) -> Optional[int]:
+        """Returns the number of moves of an optimal solution, or None if there is none."""
+        distance = self.distances[self.index(robots_state)]
+        return None if distance == UNREACHABLE else distance
+
+    def matches(self, board: Board, robot_count: int) -> bool:
+        return robot_count == self.robot_count and board.fingerprint() == self.fingerprint
+
+    @classmethod
+    def build(cls, board: Board, robot_count: int) -> "Tablebase":
+        """Computes the distance of every state with a retrograde BFS from the goal states.
+
+        Parameters:
+        board (Board): The board with its walls and goals.
+        robot_count (int): The number of robots, every goal needs one of them.
+
+        Returns:
+        Tablebase: The finished table.
+        """
+        if any(goal.robot_number >= robot_count for goal in board.goals):
+            raise ValueError("Every goal needs a robot in the tablebase")
+        start_time = time.time()
+        width, height = board.board_size
+        cells = width * height
+        weights = [cells ** (robot_count - 1 - i) for i in range(robot_count)]
+        distances = bytearray([UNREACHABLE]) * (cells ** robot_count)
+
+        # For every direction and cell: whether a robot moving that way is stopped by
+        # a wall or the edge, and the cells it may have started from on an empty board
+        blocked = []
+        behind = []
+        for direction in Direction:
+            dx, dy = direction.value
+            bit = DIRECTION_BITS[direction]
+            direction_blocked = []
+            direction_behind = []
+            for cell in range(cells):
+                y, x = divmod(cell, width)
+                direction_blocked.append(
+                    bool(board.wall_index[cell] & bit)
+                    or not (0 <= x + dx < width and 0 <= y + dy < height)
+                )
+                ray = []
+                from_x, from_y = x - dx, y - dy
+                while (
+                    0 <= from_x < width
+                    and 0 <= from_y < height
+                    and not board.wall_index[from_y * width + from_x] & bit
+                ):
+                    ray.append(from_y * width + from_x)
+                    from_x, from_y = from_x - dx, from_y - dy
+                direction_behind.append(ray)
+            blocked.append(direction_blocked)
+            behind.append(direction_behind)
+        steps = [dy * width + dx for dx, dy in (direction.value for direction in Direction)]
+
+        # Layer 0: the goal robots on their goals, the other robots anywhere
+        goal_cells = {goal.robot_number: goal.y * width + goal.x for goal in board.goals}
+        free_robots = [i for i in range(robot_count) if i not in goal_cells]
+        free_cells = [cell for cell in range(cells) if cell not in goal_cells.values()]
+        for placement in permutations(free_cells, len(free_robots)):
+            index = sum(goal_cells[i] * weights[i] for i in goal_cells)
+            index += sum(cell * weights[i] for i, cell in zip(free_robots, placement))
+            distances[index] = 0
+
+        distance = 0
+        layer_size = len(distances) - distances.count(UNREACHABLE)
+        while layer_size > 0 and distance + 1 < UNREACHABLE:
+            print(f"Tablebase layer {distance}: {layer_size} states")
+            current = bytes([distance])
+            following = distance + 1
+            layer_size = 0
+
+            # Scan for the states of the current layer instead of keeping a frontier list
+            index = distances.find(current)
+            while index != -1:
+                robot_cells = []
+                rest = index
+                for weight in weights:
+                    cell, rest = divmod(rest, weight)
+                    robot_cells.append(cell)
+
+                for robot_id, cell in enumerate(robot_cells):
+                    others = robot_cells[:robot_id] + robot_cells[robot_id + 1 :]
+                    weight = weights[robot_id]
+                    for direction in range(4):
+                        # The robot only stops on this cell if something blocks the next one
+                        if not blocked[direction][cell] and cell + steps[direction] not in others:
+                            continue
+                        for previous in behind[direction][cell]:
+                            if previous in others:
+                                break
+                            previous_index = index + (previous - cell) * weight
+                            if distances[previous_index] == UNREACHABLE:
+                                distances[previous_index] = following
+                                layer_size += 1
+
+                index = distances.find(current, index + 1)
+            distance = following
+
+        print(f"Tablebase built in {time.time() - start_time:.2f} seconds")
+        return cls(board, robot_count, distances)
+
+    def save(self, path: str):
+        width, height = self.board_size
+        with open(path, "wb") as f:
+            f.write(
+                HEADER.pack(MAGIC, VERSION, width, height, self.robot_count, self.fingerprint)
+            )
+            f.write(self.distances)
+
+    @classmethod
+    def load(cls, path: str, board: Board) -> "Tablebase":
+        """Maps a tablebase file into memory, checking that it was built for the board.
+
+        Parameters:
+        path (str): The file written by save.
+        board (Board): The board the tablebase is used on.
+
+        Returns:
+        Tablebase: The table, reading the distances straight from the file.
+        """
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path} is not a tablebase")
+        magic, version, width, height, robot_count, fingerprint = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a tablebase of version {VERSION}")
+        if fingerprint != board.fingerprint():
+            raise ValueError(f"{path} was built for a different board")
+        if len(data) != HEADER.size + (width * height) ** robot_count:
+            raise ValueError(f"{path} is truncated")
+
+        # Index the mapped file directly, skipping the header
+        return cls(board, robot_count, memoryview(data)[HEADER.size :])
+
+
+def main(argv: Optional[List[str]] = None):
+    from headless import load_puzzle
+
+    parser = argparse.ArgumentParser(description="Build the tablebase of a map.")
+    parser.add_argument("map", help="JSON or binary map file")
+    parser.add_argument("--robots", type=int, default=2, help="Number of robots (default 2)")
+    parser.add_argument("--output", required=True, help="The tablebase file to write")
+    args = parser.parse_args(argv)
+
+    board, _ = load_puzzle(args.map)
+    Tablebase.build(board, args.robots).save(args.output)
+
+
+if __name__ == "__main__":
+    main()
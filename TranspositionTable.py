@@ -0,0 +1,54 @@
+from typing import List, Optional
+
+
+class TranspositionTable:
+    """A fixed-size table remembering states already searched by IDA*.
+
+    Each packed state key maps to one slot (key modulo capacity), so memory stays
+    bounded no matter how many states are searched. A slot stores the key and the
+    remaining cost budget the state was searched with. When two states share a
+    slot, the replacement policy decides which one is kept:
+
+    - "always": the newest state replaces the stored one.
+    - "depth": the state with the larger remaining budget is kept, since it
+      stands for the larger subtree.
+    """
+
+    POLICIES = ("always", "depth")
+
+    def __init__(self, capacity: int, policy: str = "depth"):
+        if capacity <= 0:
+            raise ValueError("The transposition table needs a positive capacity")
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+
+        self.capacity = capacity
+        self.policy = policy
+        self.keys: List[Optional[int]] = [None] * capacity
+        self.budgets: List[int] = [0] * capacity
+
+        # Statistics
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def lookup(self, key: int) -> Optional[int]:
+        """Returns the remaining budget a state was searched with, or None if it is not stored."""
+        slot = key % self.capacity
+        if self.keys[slot] == key:
+            self.hits += 1
+            return self.budgets[slot]
+        return None
+
+    def store(self, key: int, budget: int):
+        """Remembers that a state is searched with the given remaining budget."""
+        slot = key % self.capacity
+        stored_key = self.keys[slot]
+        if stored_key is not None and stored_key != key:
+            if self.policy == "depth" and self.budgets[slot] > budget:
+                return  # Keep the entry covering the larger subtree
+            self.replacements += 1
+
+        self.keys[slot] = key
+        self.budgets[slot] = budget
+        self.stores += 1
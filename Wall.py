@@ -23,6 +23,15 @@ class Direction(Enum):  # The side of the field the wall is located at
         return [Direction.NORTH, Direction.SOUTH, Direction.EAST, Direction.WEST][i - 1]
 
 
+# One bit per direction in the per-cell wall index of a board
+DIRECTION_BITS = {
+    Direction.NORTH: 1,
+    Direction.SOUTH: 2,
+    Direction.EAST: 4,
+    Direction.WEST: 8,
+}
+
+
 class Wall:
     def __init__(self, x: int, y: int, direction: Direction):
         self.x = x
@@ -40,6 +49,7 @@ class Wall:
                 self.y * cell_size,
                 width=4,
                 fill="black",
+                tags="wall",
             )
         elif self.direction == Direction.SOUTH:
             canvas.create_line(
@@ -49,6 +59,7 @@ class Wall:
                 (self.y + 1) * cell_size,
                 width=4,
                 fill="black",
+                tags="wall",
             )
         elif self.direction == Direction.EAST:
             canvas.create_line(
@@ -58,6 +69,7 @@ class Wall:
                 (self.y + 1) * cell_size,
                 width=4,
                 fill="black",
+                tags="wall",
             )
         elif self.direction == Direction.WEST:
             canvas.create_line(
@@ -67,4 +79,5 @@ class Wall:
                 (self.y + 1) * cell_size,
                 width=4,
                 fill="black",
+                tags="wall",
             )
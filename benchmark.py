@@ -0,0 +1,222 @@
+"""Benchmark the solvers over the bundled maps and seeded random positions.
+
+    python3 benchmark.py --json results.json --csv results.csv --baseline benchmarks/baseline.json
+
+Node counts are deterministic, so any increase beyond the tolerance is reported
+as a regression. Times vary between machines and get a looser tolerance.
+"""
+import argparse
+import csv
+import json
+import random
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from Board import Board
+from GraphSearchAI import RobotsState
+from MapDataClass import GoalData
+from PuzzleGenerator import place_puzzle
+from Robot import DEFAULT_ROBOTS
+from headless import ALGORITHMS, load_puzzle, solve_puzzle
+
+MAPS = ["maps/default.json", "maps/easy.json", "maps/medium.json", "maps/hard.json"]
+
+# Measurements that may not grow by more than the tolerance compared to the baseline
+COUNTERS = ["nodes_expanded", "nodes_generated", "peak_frontier", "peak_memory_kb"]
+
+# Peak memory below this many KiB is too noisy to compare, like times below 0.05 s
+MEMORY_FLOOR_KB = 256
+
+FIELDS = [
+    "puzzle",
+    "algorithm",
+    "moves",
+    "nodes_expanded",
+    "nodes_generated",
+    "peak_frontier",
+    "peak_memory_kb",
+    "seconds",
+    "error",
+]
+
+
+# A puzzle as its name, map file, goals (None for the goals of the map) and robot starts
+Puzzle = Tuple[str, str, Optional[List[GoalData]], RobotsState]
+
+
+def random_puzzle(
+    rng: random.Random, map_path: str, walk_length: int
+) -> Tuple[Board, RobotsState]:
+    """Places the robots on a map at random and the goals where a random walk ends.
+
+    One or two robots get a goal, so every puzzle is solvable in at most
+    walk_length moves.
+    """
+    board, _ = load_puzzle(map_path)
+    return board, place_puzzle(rng, board, len(DEFAULT_ROBOTS), walk_length)
+
+
+def puzzles(seed: int, random_count: int, walk_length: int) -> Iterator[Puzzle]:
+    """Yields the bundled maps followed by the seeded random puzzles."""
+    for map_path in MAPS:
+        _, initial_state = load_puzzle(map_path)
+        yield map_path, map_path, None, initial_state
+
+    rng = random.Random(seed)
+    for index in range(random_count):
+        map_path = rng.choice(MAPS)
+        board, initial_state = random_puzzle(rng, map_path, walk_length)
+        goals = [GoalData(goal.x, goal.y, goal.robot_number) for goal in board.goals]
+        yield f"random-{seed}-{index}:{map_path}", map_path, goals, initial_state
+
+
+def load_board(map_path: str, goals: Optional[List[GoalData]]) -> Board:
+    # A fresh board for every run, so no run gets the solver tables of an earlier one
+    board, _ = load_puzzle(map_path)
+    if goals is not None:
+        board.clear_goals()
+        board.create_goals(goals)
+    return board
+
+
+def run_benchmark(
+    algorithms: List[str],
+    seed: int = 0,
+    random_count: int = 8,
+    walk_length: int = 10,
+    trace_memory: bool = True,
+) -> List[dict]:
+    """Runs every algorithm on every puzzle and returns one record per run.
+
+    tracemalloc slows the search down several times, so the time and node counts
+    come from an untraced solve, and with trace_memory the peak memory from a
+    second, traced solve of the same puzzle.
+    """
+    records = []
+    for name, map_path, goals, initial_state in puzzles(seed, random_count, walk_length):
+        for ai_type in algorithms:
+            record = {"puzzle": name, "algorithm": ai_type}
+            try:
+                board = load_board(map_path, goals)
+                result = solve_puzzle(board, initial_state, ai_type)
+                record.update({field: result[field] for field in FIELDS if field in result})
+                if trace_memory:
+                    board = load_board(map_path, goals)
+                    traced = solve_puzzle(board, initial_state, ai_type, trace_memory=True)
+                    record["peak_memory_kb"] = traced["peak_memory_kb"]
+            except ValueError as error:  # The algorithm does not support this puzzle
+                record["error"] = str(error)
+            print(json.dumps(record), file=sys.stderr)
+            records.append(record)
+    return records
+
+
+def compare(
+    records: List[dict],
+    baseline: List[dict],
+    tolerance: float,
+    time_tolerance: float,
+) -> List[str]:
+    """Returns a description of every measurement that got worse than in the baseline."""
+    baseline_records: Dict[Tuple[str, str], dict] = {
+        (record["puzzle"], record["algorithm"]): record for record in baseline
+    }
+    regressions = []
+    for record in records:
+        old = baseline_records.get((record["puzzle"], record["algorithm"]))
+        if old is None:
+            continue
+        name = f"{record['puzzle']} {record['algorithm']}"
+
+        if record.get("moves") != old.get("moves"):
+            regressions.append(f"{name}: moves {old.get('moves')} -> {record.get('moves')}")
+        for field in COUNTERS:
+            if record.get(field) is None or old.get(field) is None:
+                continue
+            floor = MEMORY_FLOOR_KB if field == "peak_memory_kb" else 0
+            if record[field] > max(old[field] * (1 + tolerance), floor):
+                regressions.append(f"{name}: {field} {old[field]} -> {record[field]}")
+        if record.get("seconds") is not None and old.get("seconds") is not None:
+            # Very short runs are too noisy to compare
+            if record["seconds"] > max(old["seconds"] * (1 + time_tolerance), 0.05):
+                regressions.append(
+                    f"{name}: seconds {old['seconds']:.3f} -> {record['seconds']:.3f}"
+                )
+    return regressions
+
+
+def write_csv(path: str, records: List[dict]):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Ricochet Robots solvers.")
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        default=ALGORITHMS,
+        choices=ALGORITHMS,
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random puzzles")
+    parser.add_argument("--random", type=int, default=8, help="Number of random puzzles")
+    parser.add_argument(
+        "--walk-length",
+        type=int,
+        default=10,
+        help="Number of random moves used to place the goals of a random puzzle",
+    )
+    parser.add_argument(
+        "--no-trace-memory",
+        action="store_true",
+        help="Skip the second, traced solve of every puzzle that measures peak memory",
+    )
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    parser.add_argument("--csv", help="Write the results to this CSV file")
+    parser.add_argument("--baseline", help="Compare the results with this JSON file")
+    parser.add_argument(
+        "--save-baseline", help="Write the results to this JSON file as the new baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Allowed relative growth of node counts and memory (default 0.1)",
+    )
+    parser.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=0.5,
+        help="Allowed relative growth of wall time (default 0.5)",
+    )
+    args = parser.parse_args(argv)
+
+    records = run_benchmark(
+        args.algorithms, args.seed, args.random, args.walk_length, not args.no_trace_memory
+    )
+
+    for path in [args.json, args.save_baseline]:
+        if path:
+            with open(path, "w") as f:
+                json.dump(records, f, indent=2)
+    if args.csv:
+        write_csv(args.csv, records)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(
+                records, json.load(f), args.tolerance, args.time_tolerance
+            )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
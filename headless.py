@@ -0,0 +1,214 @@
+"""Solve maps from the command line, without tkinter or a display.
+
+Every map and algorithm combination prints one JSON object per line, e.g.:
+
+    python3 headless.py maps/easy.json maps/hard.json --algorithms bfs a_star
+"""
+import argparse
+import contextlib
+import gc
+import glob
+import json
+import sys
+import time
+import tracemalloc
+from typing import List, Optional, Tuple
+
+from BinaryMap import load_binary_map
+from Board import Board
+from GraphSearchAI import GraphSearchAI, RobotsState
+from MapDataClass import load_map
+from SearchMonitor import SearchMonitor
+from SolutionCache import SolutionCache
+from Tablebase import Tablebase
+
+ALGORITHMS = [
+    "bfs",
+    "parallel_bfs",
+    "numpy_bfs",
+    "dfs",
+    "a_star",
+    "weighted_a_star",
+    "focal",
+    "anytime",
+    "ida_star",
+    "bidirectional",
+]
+
+
+def load_puzzle(path: str) -> Tuple[Board, RobotsState]:
+    """Builds the board and the robot start positions of a map file.
+
+    Parameters:
+    path (str): The JSON map file, or a binary map ending in .rrmap.
+
+    Returns:
+    Tuple[Board, RobotsState]: The board with its walls and goals, and the robot start positions.
+    """
+    if path.endswith(".rrmap"):
+        board, robots = load_binary_map(path)
+        return board, RobotsState(robots)
+
+    map_data = load_map(path)
+    return Board.from_map(map_data), RobotsState(list(map_data.robots))
+
+
+def solve_puzzle(
+    board: Board,
+    initial_state: RobotsState,
+    ai_type: str,
+    trace_memory: bool = False,
+    **options,
+) -> dict:
+    """Solves one puzzle and returns the result and measurements as a dictionary.
+
+    Parameters:
+    board (Board): The board to solve.
+    initial_state (RobotsState): The robot start positions.
+    ai_type (str): The algorithm passed to GraphSearchAI.solve.
+    trace_memory (bool): If True, measure the peak memory of the search with
+        tracemalloc, which slows the search down.
+    options: Extra keyword arguments for GraphSearchAI.
+
+    Returns:
+    dict: The solution, its number of moves, states expanded, generated and
+    seen again, peak frontier size, proven lower bound of the A* variants, wall
+    time and peak traced memory, plus the time per search phase when a monitor with
+    phase timing is passed in the options.
+    """
+    ai = GraphSearchAI(board=board, **options)
+    # The board's precomputed tables are shared by every solve, so they are built
+    # before measuring and only the search itself is timed and traced
+    board.solver_context()
+    if trace_memory:
+        # A full collection empties the interpreter's free lists, so objects freed by
+        # earlier solves cannot be reused untraced and every reading is the same
+        gc.collect()
+        tracemalloc.start()
+
+    peak_memory_kb: Optional[int] = None
+    try:
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stderr):  # Keep stdout machine-readable
+            solution = ai.solve(initial_state, ai_type)
+        seconds = time.perf_counter() - start_time
+        if trace_memory:
+            peak_memory_kb = tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        # A failed solve must not leave tracing on for the next one
+        if trace_memory:
+            tracemalloc.stop()
+
+    result = {
+        "algorithm": ai_type,
+        "moves": None if solution is None else len(solution),
+        "solution": None
+        if solution is None
+        else [
+            [robot_id, move.direction.name, list(move.final_position)]
+            for robot_id, move in solution
+        ],
+        "nodes_expanded": ai.stats.expanded,
+        "nodes_generated": ai.stats.generated,
+        "duplicates": ai.stats.duplicates,
+        "peak_frontier": ai.stats.peak_frontier,
+        "move_memo_hits": ai.stats.move_memo_hits,
+        "move_memo_misses": ai.stats.move_memo_misses,
+        "lower_bound": ai.stats.lower_bound,
+        "seconds": round(seconds, 6),
+        "peak_memory_kb": peak_memory_kb,
+    }
+    if ai.stats.phase_seconds:
+        result["phase_seconds"] = {
+            name: round(seconds, 6) for name, seconds in ai.stats.phase_seconds.items()
+        }
+    return result
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Solve Ricochet Robots maps without a UI.")
+    parser.add_argument(
+        "maps",
+        nargs="*",
+        help="JSON or binary .rrmap map files (default: every JSON map in maps/)",
+    )
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        default=["bfs"],
+        choices=ALGORITHMS + ["tablebase"],
+        help="The algorithms to run on every map",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Measure the peak memory of each search with tracemalloc (slower)",
+    )
+    parser.add_argument(
+        "--symmetry-reduction",
+        action="store_true",
+        help="Treat robots without a goal as interchangeable",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report the time spent in each search phase (slower)",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="Reuse solutions stored in this sqlite file and store new ones in it",
+    )
+    parser.add_argument(
+        "--tablebase",
+        metavar="PATH",
+        help="Tablebase file built by Tablebase.py, used by the tablebase algorithm",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Stop the anytime algorithm after this many seconds",
+    )
+    parser.add_argument(
+        "--node-budget",
+        type=int,
+        metavar="STATES",
+        help="Stop the anytime algorithm after expanding this many states",
+    )
+    parser.add_argument(
+        "--weight",
+        type=float,
+        default=1.5,
+        help="Factor the weighted_a_star and focal solutions may exceed the optimal length by",
+    )
+    args = parser.parse_args(argv)
+    cache = SolutionCache(args.cache) if args.cache else None
+
+    for path in args.maps or sorted(glob.glob("maps/*.json")):
+        for ai_type in args.algorithms:
+            board, initial_state = load_puzzle(path)
+            try:
+                tablebase = None
+                if ai_type == "tablebase" and args.tablebase:
+                    tablebase = Tablebase.load(args.tablebase, board)
+                result = solve_puzzle(
+                    board,
+                    initial_state,
+                    ai_type,
+                    args.trace_memory,
+                    symmetry_reduction=args.symmetry_reduction,
+                    monitor=SearchMonitor() if args.profile else None,
+                    cache=cache,
+                    tablebase=tablebase,
+                    time_budget=args.time_budget,
+                    node_budget=args.node_budget,
+                    weight=args.weight,
+                )
+            except ValueError as error:  # The algorithm does not support this puzzle
+                result = {"algorithm": ai_type, "error": str(error)}
+            print(json.dumps({"map": path, **result}), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
 from enum import Enum
 from AIInterface import AIInterface
 from GraphSearchAI import GraphSearchAI
-from typing import List, Tuple
-from MapDataClass import WallData
+from typing import Tuple
+from MapDataClass import MapData, load_map
+from SolutionCache import SolutionCache
 from ui import RicochetRobotsUI
-import json
 import tkinter as tk
 
 
@@ -50,9 +50,8 @@ class RicochetRobotMenu:
         self.master.destroy()
         run_ricochet_robots_ui(self.load_map(map_name))
 
-    def load_map(self, map_name: MapName) -> List[WallData]:
-        with open(str.format("maps/{}.json", map_name.value), "r") as f:
-            return json.loads(f.read(), object_hook=WallData.to_object)
+    def load_map(self, map_name: MapName) -> MapData:
+        return load_map(str.format("maps/{}.json", map_name.value))
 
 
 def run_ricochet_robots_ui(map_data):
@@ -60,23 +59,44 @@ def run_ricochet_robots_ui(map_data):
     root.title("Ricochet Robots")
     game_ui = RicochetRobotsUI(root, map_data)
     ai_interface = AIInterface(game_ui)
+    cache = SolutionCache()
 
     tk.Button(
         root,
         text="Solve with BFS",
-        command=lambda: GraphSearchAI.build_solution_and_play(ai_interface, "bfs"),
+        command=lambda: GraphSearchAI.build_solution_and_play(
+            ai_interface, "bfs", cache=cache
+        ),
     ).pack(side="left", fill="x")
 
     tk.Button(
         root,
         text="Solve with DFS",
-        command=lambda: GraphSearchAI.build_solution_and_play(ai_interface, "dfs"),
+        command=lambda: GraphSearchAI.build_solution_and_play(
+            ai_interface, "dfs", cache=cache
+        ),
     ).pack(side="left", fill="x")
 
     tk.Button(
         root,
         text="Solve with A*",
-        command=lambda: GraphSearchAI.build_solution_and_play(ai_interface, "a_star"),
+        command=lambda: GraphSearchAI.build_solution_and_play(
+            ai_interface, "a_star", cache=cache
+        ),
+    ).pack(side="left", fill="x")
+
+    tk.Button(
+        root,
+        text="Solve with IDA*",
+        command=lambda: GraphSearchAI.build_solution_and_play(
+            ai_interface, "ida_star", cache=cache
+        ),
+    ).pack(side="left", fill="x")
+
+    tk.Button(
+        root,
+        text="Cancel",
+        command=game_ui.cancel_solve,
     ).pack(side="left", fill="x")
 
     tk.Button(
@@ -0,0 +1,146 @@
+"""Measure solver throughput on streams of seeded random puzzles.
+
+    python3 throughput.py --sizes 8x8 16x16 32x32 --robots 2 3 4 --count 50 --algorithms a_star
+
+Every combination of board size, robot count and algorithm solves the same
+stream of puzzles and reports the solves per second and latency percentiles,
+which shows how the solvers scale with the board size and the number of robots.
+"""
+import argparse
+import json
+import math
+import time
+from itertools import islice
+from typing import List, Optional, Tuple
+
+from PuzzleGenerator import random_puzzles
+from headless import ALGORITHMS, solve_puzzle
+
+
+def board_size(text: str) -> Tuple[int, int]:
+    width, _, height = text.partition("x")
+    return int(width), int(height or width)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest-rank percentile of an already sorted list
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def measure(
+    algorithm: str,
+    size: Tuple[int, int],
+    robot_count: int,
+    count: int,
+    seed: int = 0,
+    walk_length: int = 10,
+    min_moves: int = 4,
+) -> dict:
+    """Solves count random puzzles with one algorithm and summarizes the timings.
+
+    Parameters:
+    algorithm (str): The algorithm passed to GraphSearchAI.solve.
+    size (Tuple[int, int]): The board size of the puzzles.
+    robot_count (int): The number of robots of the puzzles.
+    count (int): The number of puzzles to solve.
+    seed (int): The seed of the puzzle stream.
+    walk_length (int): The random moves used to place the goals.
+    min_moves (int): The fewest moves of the puzzles, so trivial ones are skipped.
+
+    Returns:
+    dict: The solves per second, latency percentiles in milliseconds, mean
+    states expanded and the number of puzzles left unsolved or unsupported.
+    """
+    latencies = []
+    expanded = 0
+    failures = 0
+    start_time = time.perf_counter()
+    puzzles = random_puzzles(
+        seed, size, robot_count, walk_length, min_moves=min_moves
+    )
+    for board, initial_state in islice(puzzles, count):
+        try:
+            result = solve_puzzle(board, initial_state, algorithm)
+        except ValueError:  # The algorithm does not support this puzzle
+            failures += 1
+            continue
+        if result["moves"] is None:
+            failures += 1
+        latencies.append(result["seconds"])
+        expanded += result["nodes_expanded"]
+    total_seconds = time.perf_counter() - start_time
+
+    summary = {
+        "algorithm": algorithm,
+        "board_size": f"{size[0]}x{size[1]}",
+        "robots": robot_count,
+        "puzzles": count,
+        "failures": failures,
+    }
+    if latencies:
+        latencies.sort()
+        summary.update(
+            {
+                # Puzzle generation is excluded, only the time spent solving counts
+                "solves_per_second": round(len(latencies) / sum(latencies), 2),
+                "p50_ms": round(1000 * percentile(latencies, 0.5), 2),
+                "p90_ms": round(1000 * percentile(latencies, 0.9), 2),
+                "p99_ms": round(1000 * percentile(latencies, 0.99), 2),
+                "max_ms": round(1000 * latencies[-1], 2),
+                "mean_expanded": round(expanded / len(latencies)),
+                "total_seconds": round(total_seconds, 2),
+            }
+        )
+    return summary
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Measure solver throughput on random puzzles.")
+    parser.add_argument(
+        "--sizes", nargs="+", type=board_size, default=[(16, 16)], help="Board sizes, e.g. 16x16"
+    )
+    parser.add_argument("--robots", nargs="+", type=int, default=[3], help="Robot counts")
+    parser.add_argument(
+        "--algorithms", nargs="+", default=["a_star"], choices=ALGORITHMS
+    )
+    parser.add_argument("--count", type=int, default=20, help="Puzzles per combination")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the puzzle stream")
+    parser.add_argument(
+        "--walk-length",
+        type=int,
+        default=10,
+        help="Number of random moves used to place the goals of a puzzle",
+    )
+    parser.add_argument(
+        "--min-moves",
+        type=int,
+        default=4,
+        help="Skip puzzles whose optimal solution is shorter, at most --walk-length",
+    )
+    parser.add_argument("--json", help="Write the summaries to this JSON file")
+    args = parser.parse_args(argv)
+
+    summaries = []
+    for size in args.sizes:
+        for robot_count in args.robots:
+            for algorithm in args.algorithms:
+                summary = measure(
+                    algorithm,
+                    size,
+                    robot_count,
+                    args.count,
+                    args.seed,
+                    args.walk_length,
+                    args.min_moves,
+                )
+                print(json.dumps(summary), flush=True)
+                summaries.append(summary)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,56 +1,62 @@
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 import tkinter as tk
 from Board import Board
-from MapDataClass import WallData
+from MapDataClass import MapData, robot_color
 from Robot import Robot
 from Wall import Direction
 from copy import deepcopy
 
+if TYPE_CHECKING:
+    from SolveJob import SolveJob
+
 
 class RicochetRobotsUI:
-    def __init__(
-        self,
-        master: tk.Tk,
-        map_data: List[WallData],
-        board_size: Tuple[int, int] = (16, 16),
-    ):
+    def __init__(self, master: tk.Tk, map_data: MapData):
         # Initialize board and UI elements
-        self.board_size = board_size
+        self.board_size = map_data.board_size
         self.master = master
-        self.board = Board(board_size)
-        self.cell_size = 30  # size of every cell on the board
+        self.board: Board = None
+        # size of every cell on the board, smaller on large boards so they fit on screen
+        self.cell_size = max(12, min(30, 720 // max(self.board_size)))
         self.steps = 0
 
         # Define robots, their station position, color and number.
         self.robots_original_positions = [
-            Robot((2, 3), "red", 0),
-            Robot((3, 3), "blue", 1),
-            Robot((4, 3), "green", 2),
-            # Robot((5, 3), "yellow", 3),
+            Robot(position, robot_color(robot_id), robot_id)
+            for robot_id, position in enumerate(map_data.robots)
         ]
         self.current_robot = 0
         self.robots: List[Robot] = None
+        self.robot_items: List[int] = []  # Canvas item of every robot, by robot_id
 
         # Canvas setup
         canvas_width = (self.board_size[0] + 1) * self.cell_size
         canvas_height = (self.board_size[1] + 1) * self.cell_size
         self.canvas = tk.Canvas(master, width=canvas_width, height=canvas_height)
         self.canvas.pack()
+
+        # Status line showing the progress of the solver
+        self.status = tk.Label(master, anchor="w")
+        self.status.pack(fill="x")
+        self.solve_job: Optional["SolveJob"] = None  # The running solve and replay, if any
+
         self.init_ui()
         self.init_game(map_data)
-        self.draw_robots()
+        # Walls and goals never change during a game, so they are only drawn once
         self.draw_walls()
         self.draw_goals()
+        self.draw_robots()
         self.bind_keys()
 
     def init_ui(self):  # Draw grid lines
+        font = ("Arial", min(12, self.cell_size // 2))
         for x in range(self.board_size[0] + 1):
             # Write indices at the bottom
             self.canvas.create_text(
                 x * self.cell_size + self.cell_size / 2,
                 self.board_size[1] * self.cell_size + self.cell_size / 2,
                 text=str(x),
-                font=("Arial", 12),
+                font=font,
             )
             self.canvas.create_line(
                 x * self.cell_size,
@@ -64,7 +70,7 @@ class RicochetRobotsUI:
                 self.board_size[0] * self.cell_size + self.cell_size / 2,
                 y * self.cell_size + self.cell_size / 2,
                 text=str(y),
-                font=("Arial", 12),
+                font=font,
             )
             self.canvas.create_line(
                 0,
@@ -73,31 +79,35 @@ class RicochetRobotsUI:
                 y * self.cell_size,
             )
 
-    def init_game(self, map_data: List[WallData]):  # Load map and robot position
+    def init_game(self, map_data: MapData):  # Load map and robot position
         # Load map data
-        for data in map_data:
-            self.board.add_wall(
-                data.x_pos, data.y_pos, Direction.from_int(data.direction)
-            )
+        self.board = Board.from_map(map_data)
 
         self.robots = deepcopy(self.robots_original_positions)
         self.current_robot = 0
 
     def reset_game(self):
+        self.cancel_solve()
         self.steps = 0
         self.robots = deepcopy(self.robots_original_positions)
         self.current_robot = 0
         self.update_board()
 
+    def robot_coords(self, robot: Robot) -> Tuple[int, int, int, int]:
+        x1, y1 = (
+            robot.position[0] * self.cell_size,
+            robot.position[1] * self.cell_size,
+        )
+        return x1, y1, x1 + self.cell_size, y1 + self.cell_size
+
     def draw_robots(self):
-        # self.canvas.delete("robot")  # Clear existing robots
-        for robot in self.robots:
-            x1, y1 = (
-                robot.position[0] * self.cell_size,
-                robot.position[1] * self.cell_size,
+        self.canvas.delete("robot")  # Clear existing robots
+        self.robot_items = [
+            self.canvas.create_rectangle(
+                *self.robot_coords(robot), fill=robot.color, tags="robot"
             )
-            x2, y2 = x1 + self.cell_size, y1 + self.cell_size
-            self.canvas.create_rectangle(x1, y1, x2, y2, fill=robot.color, tags="robot")
+            for robot in self.robots
+        ]
 
     def draw_walls(self):
         self.canvas.delete("wall")  # Clear existing walls
@@ -105,16 +115,13 @@ class RicochetRobotsUI:
             wall.draw(self.canvas, self.cell_size)
 
     def draw_goals(self):
+        self.canvas.delete("goal")  # Clear existing goals
         for goal in self.board.goals:
             goal.draw(self.canvas, self.cell_size)
 
-    def update_board(self):  # Updates the board visually
-        self.canvas.delete("wall")
-        self.canvas.delete("robot")
-        self.canvas.delete("goal")
-        self.draw_walls()
-        self.draw_goals()
-        self.draw_robots()
+    def update_board(self):  # Moves the robot items to the current robot positions
+        for robot, item in zip(self.robots, self.robot_items):
+            self.canvas.coords(item, *self.robot_coords(robot))
 
     def move(self, direction: Direction):
         other_positions = [
@@ -126,13 +133,26 @@ class RicochetRobotsUI:
         print("steps: ", self.steps)
         self.update_board()
 
+    def show_status(self, text: str):
+        self.status.config(text=text)
+
+    def cancel_solve(self):
+        if self.solve_job is not None and not self.solve_job.finished:
+            self.solve_job.cancel()
+
+    def player_move(self, direction: Direction):
+        # A move by the player makes a pending solution replay meaningless
+        self.cancel_solve()
+        self.move(direction)
+
     def switch_robot(self, event):
-        if event.char in "1234":
+        # Keys 1 to 9 select a robot, as long as the map has that many
+        if event.char.isdigit() and 1 <= int(event.char) <= len(self.robots):
             self.current_robot = int(event.char) - 1
 
     def bind_keys(self):
-        self.master.bind("<Up>", lambda e: self.move(Direction.NORTH))
-        self.master.bind("<Down>", lambda e: self.move(Direction.SOUTH))
-        self.master.bind("<Left>", lambda e: self.move(Direction.WEST))
-        self.master.bind("<Right>", lambda e: self.move(Direction.EAST))
+        self.master.bind("<Up>", lambda e: self.player_move(Direction.NORTH))
+        self.master.bind("<Down>", lambda e: self.player_move(Direction.SOUTH))
+        self.master.bind("<Left>", lambda e: self.player_move(Direction.WEST))
+        self.master.bind("<Right>", lambda e: self.player_move(Direction.EAST))
         self.master.bind("<Key>", self.switch_robot)